@@ -7,11 +7,80 @@ from typing import Optional # Optional import edildi
 class Settings(BaseSettings):
     # MongoDB Settings
     MONGO_URI: str = "mongodb://localhost:27017/netflix_clone_db"
+    # Bağlantı havuzu: MIN_POOL_SIZE bağlantı açılışta kurulur; havuz doluysa istek en fazla
+    # WAIT_QUEUE_TIMEOUT bekler. COMPRESSORS boş bırakılırsa kablo sıkıştırması kapanır
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_COMPRESSORS: str = "zlib"
+    MONGO_ZLIB_COMPRESSION_LEVEL: int = 6
+    # Operasyon grubu başına okuma tercihi / read concern (app/core/read_policies.py).
+    # Katalog okumaları (içerik listesi/detayı, ana sayfa, arama, kategoriler) hafif bayatlığa toleranslıdır ve
+    # replica set'in ikincil üyelerinden okunabilir; MAX_STALENESS en az 90 sn olmalıdır (-1: sınır yok).
+    # Kullanıcı okumaları (kimlik, profil, watchlist, izleme geçmişi) kendi yazmalarını görmelidir: primary.
+    # Katalog yazan worker, yazmadan sonraki MAX_STALENESS saniye boyunca katalogu primary'den okur; diğer
+    # worker'lar yazmayı paylaşılan katalog versiyonunu okuduklarında (liste ETag'i) hemen, aksi halde en geç
+    # CATALOG_CACHE_TTL_SECONDS + MAX_STALENESS saniye sonra görür. Varlık
+    # doğrulamaları (kategori, içerik) ikincilde bulunamayanı primary'de tekrar kontrol eder.
+    # Replica set olmayan (tek sunuculu) kurulumda okuma tercihi etkisizdir
+    MONGO_CATALOG_READ_PREFERENCE: str = "secondaryPreferred"
+    MONGO_CATALOG_MAX_STALENESS_SECONDS: int = 90
+    MONGO_CATALOG_READ_CONCERN: str = "local"
+    MONGO_USER_READ_PREFERENCE: str = "primary"
+    MONGO_USER_READ_CONCERN: str = "local"
 
     # JWT Settings
     SECRET_KEY: str = "a_very_secret_key_that_should_be_in_env_and_long" # Varsayılan değer
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 # Varsayılan 30 dakika
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30 # Refresh token'lar her kullanımda yenilenir (rotasyon)
+    # Şifre hashleme: bcrypt maliyeti (değişirse eski hash'ler girişte yeniden hashlenir) ve event loop'u
+    # bloklamamak için kullanılan thread havuzu (aynı anda en fazla MAX_WORKERS işlem, sırada en fazla
+    # QUEUE_TIMEOUT saniye beklenir, aşılırsa 503). MAX_WORKERS=0 havuzu kapatır (sadece karşılaştırma için)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0
+
+    # Doğrulanmış JWT önbelleği (token özeti -> claim'ler, exp'e kadar): imza her istekte yeniden doğrulanmaz
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Arama Ayarları: alaka sıralamasında skor = textScore + SEARCH_RATING_WEIGHT * rating
+    SEARCH_RATING_WEIGHT: float = 0.2
+
+    # Typeahead (/content/suggest) prefix indeksi: süreç içinde tutulur ve bu yaştan eskiyse tüm içeriklerden
+    # yeniden kurulur; diğer worker'lardaki içerik yazmaları en geç bu süre sonra önerilerde görülür
+    SUGGEST_INDEX_MAX_AGE_SECONDS: float = 300.0
+
+    # Ana sayfa (/home) satırı başına varsayılan içerik sayısı
+    HOME_ROW_LIMIT: int = 20
+
+    # Katalog okuma önbelleği (get_contents, get_content, kategoriler): TTL + LRU, yazmalarda etiketle geçersiz kılınır
+    # Watchlist/geçmiş sayfalarındaki içerik özetleri de id başına burada tutulur (kayıt başına birkaç yüz byte)
+    CATALOG_CACHE_ENABLED: bool = True
+    CATALOG_CACHE_TTL_SECONDS: float = 60.0
+    CATALOG_CACHE_MAX_ENTRIES: int = 10000
+
+    # Kimliği doğrulanmış kullanıcı (principal) önbelleği: get_current_user her istekte veritabanına gitmesin.
+    # Bu süreçteki profil/tercih/şifre güncellemeleri ve pasifleştirme anında geçersiz kılar; diğer worker'lar
+    # değişikliği en geç TTL sonra görür
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # İzleme ilerlemesi heartbeat'leri için write-behind tamponu: (kullanıcı, içerik) başına en son değer
+    # bellekte tutulur ve her FLUSH_INTERVAL saniyede bir bulk_write ile yazılır; son yazılandan
+    # MIN_DELTA puandan az değişen ilerleme yazılmaz
+    WATCH_PROGRESS_WRITE_BEHIND: bool = False
+    WATCH_PROGRESS_FLUSH_INTERVAL_SECONDS: float = 5.0
+    WATCH_PROGRESS_MIN_DELTA: int = 1
+    WATCH_PROGRESS_MAX_PENDING: int = 10000
+
+    # Test modu: açılışta app/core/query_plans.py'deki sorgu şekillerini explain() ile doğrula
+    VERIFY_QUERY_PLANS: bool = False
 
     # Seed Script için Admin Kullanıcı Bilgileri (YENİ)
     ADMIN_EMAIL: Optional[str] = None
@@ -1,28 +1,73 @@
 # app/core/db.py
 
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from beanie import init_beanie
 from .config import settings
-from typing import List, Type
+from typing import Any, Dict, List, Optional, Type
 from pydantic import BaseModel
 
 # Uygulamanızdaki tüm Beanie döküman modellerini (tabloları) buraya import edin
 # Örnek: from app.models.user import User
 # from app.models.content import Content
 
+# Süreç başına tek MongoDB istemcisi (ve bağlantı havuzu). init_db'de oluşturulur, lifespan kapanışında
+# close_db ile kapatılır. Beanie modelleri ve ham motor okumaları (Model.get_motor_collection()) bu
+# istemcinin havuzunu kullanır; Beanie dışında veritabanına erişmek gereken kod get_database() kullanmalıdır.
+_client: Optional[AsyncIOMotorClient] = None
+
+
+def client_options() -> Dict[str, Any]:
+    """Settings'teki havuz, zaman aşımı ve sıkıştırma ayarlarından istemci seçenekleri."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+    }
+    if settings.MONGO_COMPRESSORS:
+        # Sunucu desteklemiyorsa sıkıştırmasız devam edilir
+        options["compressors"] = settings.MONGO_COMPRESSORS
+        options["zlibCompressionLevel"] = settings.MONGO_ZLIB_COMPRESSION_LEVEL
+    return options
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Paylaşılan istemci; init_db çağrılmadan kullanılırsa RuntimeError."""
+    if _client is None:
+        raise RuntimeError("MongoDB client is not initialized; call init_db() first")
+    return _client
+
+
+def get_database() -> AsyncIOMotorDatabase:
+    return get_client()[settings.MONGO_DB_NAME]
+
+
+async def _prewarm_pool(client: AsyncIOMotorClient, connections: int) -> None:
+    # Eşzamanlı ping'ler havuzda minPoolSize kadar bağlantıyı açılışta kurar; ilk istekler
+    # TCP/TLS el sıkışması ve kimlik doğrulaması beklemez
+    if connections > 0:
+        await asyncio.gather(*[client.admin.command("ping") for _ in range(connections)])
+
+
 async def init_db(document_models: List[Type[BaseModel]]):
     """
     Initializes the Beanie ODM with the MongoDB client and document models.
     This should be called on application startup.
     """
-    client = AsyncIOMotorClient(settings.MONGO_URI)
-    
+    global _client
+    client = AsyncIOMotorClient(settings.MONGO_URI, **client_options())
+
     # Veritabanı bağlantısını test et (opsiyonel ama iyi bir pratik)
     try:
         await client.admin.command('ping')
-        print("Successfully connected to MongoDB!")
+        await _prewarm_pool(client, settings.MONGO_MIN_POOL_SIZE)
+        print(f"Successfully connected to MongoDB! (pool min={settings.MONGO_MIN_POOL_SIZE} max={settings.MONGO_MAX_POOL_SIZE})")
     except Exception as e:
         print(f"Could not connect to MongoDB: {e}")
+        client.close()
         # Uygulamanın devam etmesini engelleyebilirsiniz veya hata loglayabilirsiniz
         raise
 
@@ -31,10 +76,20 @@ async def init_db(document_models: List[Type[BaseModel]]):
         database=client[settings.MONGO_DB_NAME], # client.get_database() de kullanılabilir
         document_models=document_models
     )
+    _client = client
     print(f"Beanie initialized with database: {settings.MONGO_DB_NAME} and models: {[model.__name__ for model in document_models]}")
 
+
+async def close_db() -> None:
+    """Paylaşılan istemciyi ve havuzdaki bağlantıları kapatır (uygulama kapanışında)."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+        print("MongoDB client closed.")
+
 # Veritabanı session'ı için bir dependency (Beanie'de doğrudan session yönetimi farklıdır,
 # bu fonksiyon şimdilik gerekli değil, ama CRUD operasyonları için benzer yapılar kurulabilir.)
 # Beanie doğrudan async metodlar sağlar.
 # async def get_db_session():
-#     pass
\ No newline at end of file
+#     pass
@@ -0,0 +1,195 @@
+# app/core/query_plans.py
+
+# app/crud/* içindeki sıcak sorguların şekilleri (filtre + sıralama) ve her birini karşılaması
+# beklenen indeks burada bildirilir. İndekslerin kendisi modellerin Settings.indexes listesinde
+# tanımlıdır ve init_beanie tarafından oluşturulur; bu modül iki şeyi doğrular:
+#   1) her şeklin beklediği indeks modelde gerçekten bildirilmiş mi (statik kontrol),
+#   2) MongoDB explain() planında COLLSCAN veya bellek içi SORT var mı (test modu).
+#
+# Test modu: VERIFY_QUERY_PLANS=true ile uygulama açılışta doğrular ve hata varsa başlamaz,
+# ya da doğrudan: python -m app.core.query_plans
+
+import asyncio
+import sys
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from beanie import Document
+from bson import DBRef, ObjectId
+
+from app.models.category import CategoryDocument
+from app.models.refresh_token import RefreshTokenDocument
+from app.models.content import ContentDocument
+from app.models.user import UserDocument
+from app.models.watch_history import (
+    WatchHistoryItemDocument, CONTINUE_WATCHING_MIN_PROGRESS, CONTINUE_WATCHING_MAX_PROGRESS
+)
+from app.models.watchlist import WatchlistItemDocument
+from app.utils.pagination import keyset_sort
+
+# /content listesinde sort_by ile izin verilen alanlar; hepsi (alan, _id) indeksiyle desteklenir
+CONTENT_SORT_FIELDS = ("rating", "title")
+# sort_by sorgu parametresi için desen (örn: "rating", "-rating", "title", "$textScore")
+CONTENT_SORT_PATTERN = r"^(-?(" + "|".join(CONTENT_SORT_FIELDS) + r")|\$textScore)$"
+
+
+def parse_content_sort(sort_by: Optional[str], filtered: bool = False) -> Tuple[str, int]:
+    """
+    sort_by parametresini (alan, yön) çiftine çevirir. Belirtilmemişse filtresiz listede _id artan,
+    filtreli listede (tür, öne çıkan, trend, kategori) puan azalan sıra kullanılır; ikisi de indeksle karşılanır.
+    Sadece indeksle desteklenen alanlara (CONTENT_SORT_FIELDS) izin verilir.
+    """
+    if not sort_by or sort_by == "$textScore":
+        return ("rating", -1) if filtered else ("_id", 1)
+    field, direction = (sort_by[1:], -1) if sort_by.startswith("-") else (sort_by, 1)
+    if field not in CONTENT_SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field: {field}")
+    return field, direction
+
+
+class QueryShape(NamedTuple):
+    name: str
+    model: Type[Document]
+    filter: Dict[str, Any] # Örnek değerlerle filtre (explain için)
+    sort: Optional[List[Tuple[str, int]]] # PyMongo stili sıralama
+    index: str # Şekli karşılaması beklenen (modelde bildirilmiş) indeks adı
+    allow_in_memory_sort: bool = False
+
+
+_SAMPLE_ID = ObjectId("000000000000000000000000")
+_USER_REF = DBRef("users", _SAMPLE_ID)
+_CONTENT_REF = DBRef("contents", _SAMPLE_ID)
+
+# /content listesi (ve ana sayfa satırları): filtre -> (örnek filtre, {sıralama alanı: indeks})
+CONTENT_LIST_FILTERS: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {
+    "": ({}, {"_id": "_id_", "rating": "rating_id_idx", "title": "title_id_idx"}),
+    "type": ({"content_type": "MOVIE"}, {"rating": "content_type_rating_idx", "title": "content_type_title_idx"}),
+    "featured": ({"featured": True}, {"rating": "featured_rating_idx", "title": "featured_title_idx"}),
+    "trending": ({"trending": True}, {"rating": "trending_rating_idx", "title": "trending_title_idx"}),
+    "category": ({"categories.$id": {"$in": [_SAMPLE_ID]}}, {"rating": "categories_rating_idx", "title": "categories_title_idx"}),
+}
+# sort_by'ın alabileceği değerler ($textScore aramasız istekte varsayılanla aynıdır)
+CONTENT_LIST_SORTS = (None, "rating", "-rating", "title", "-title")
+
+
+def _content_list_shapes() -> List[QueryShape]:
+    """get_contents'in gönderdiği her filtre x sıralama birleşimi; sıralama parse_content_sort ile üretilir."""
+    shapes = []
+    for filter_name, (sample_filter, indexes) in CONTENT_LIST_FILTERS.items():
+        for sort_by in CONTENT_LIST_SORTS:
+            field, direction = parse_content_sort(sort_by, filtered=bool(sample_filter))
+            name = ".".join(part for part in ("content.list", filter_name, sort_by) if part)
+            shapes.append(QueryShape(name, ContentDocument, sample_filter, keyset_sort(field, direction), indexes[field]))
+    return shapes
+
+
+QUERY_SHAPES: List[QueryShape] = [
+    # crud/content.py
+    QueryShape("content.get", ContentDocument, {"_id": _SAMPLE_ID}, None, "_id_"),
+    *_content_list_shapes(),
+    QueryShape("content.by_source", ContentDocument, {"source_name": "homeData", "source_id": 1}, None, "source_idx"),
+    # Alaka + puan harmanlı sıralama hesaplanan bir değere göre olduğundan indeksle karşılanamaz
+    QueryShape("content.search", ContentDocument, {"$text": {"$search": "casino"}}, None, "content_text_search_idx", allow_in_memory_sort=True),
+    # crud/category.py
+    QueryShape("category.get", CategoryDocument, {"_id": _SAMPLE_ID}, None, "_id_"),
+    # Ad ile arama ve ad -> id çözümlemesi kategori kaydından (bellekten) yapılır
+    # crud/user.py
+    QueryShape("user.by_id", UserDocument, {"_id": _SAMPLE_ID}, None, "_id_"),
+    QueryShape("user.by_email", UserDocument, {"email": "user@example.com"}, None, "email_1"),
+    QueryShape("user.by_username", UserDocument, {"username": "user"}, None, "username_1"),
+    # crud/refresh_token.py
+    QueryShape("refresh_token.by_hash", RefreshTokenDocument, {"token_hash": "0" * 64}, None, "token_hash_unique_idx"),
+    QueryShape("refresh_token.family", RefreshTokenDocument, {"family_id": "0" * 32}, None, "family_idx"),
+    QueryShape("refresh_token.user", RefreshTokenDocument, {"user_id": _SAMPLE_ID}, None, "user_idx"),
+    # crud/watchlist.py
+    QueryShape("watchlist.item", WatchlistItemDocument, {"user": _USER_REF, "content": _CONTENT_REF}, None, "user_content_unique_idx"),
+    QueryShape("watchlist.by_contents", WatchlistItemDocument, {"user": _USER_REF, "content": {"$in": [_CONTENT_REF]}}, None, "user_content_unique_idx"),
+    QueryShape("watchlist.list", WatchlistItemDocument, {"user": _USER_REF}, [("added_at", -1), ("_id", -1)], "user_added_at_idx"),
+    # crud/watch_history.py
+    QueryShape("watch_history.item", WatchHistoryItemDocument, {"user": _USER_REF, "content": _CONTENT_REF}, None, "user_content_history_unique_idx"),
+    QueryShape("watch_history.by_contents", WatchHistoryItemDocument, {"user": _USER_REF, "content": {"$in": [_CONTENT_REF]}}, None, "user_content_history_unique_idx"),
+    QueryShape("watch_history.list", WatchHistoryItemDocument, {"user": _USER_REF}, [("last_watched_at", -1), ("_id", -1)], "user_last_watched_at_idx"),
+    QueryShape("watch_history.continue_watching", WatchHistoryItemDocument, {"user": _USER_REF, "progress_percentage": {"$gte": 1, "$lte": 95}}, [("last_watched_at", -1), ("_id", -1)], "continue_watching_progress_idx"),
+]
+
+
+def declared_index_names(model: Type[Document]) -> List[str]:
+    """Modelin Settings.indexes ve Indexed(...) alanlarından oluşacak indeks adları (+ _id_)."""
+    names = ["_id_"]
+    for index in getattr(model.Settings, "indexes", []) or []:
+        names.append(index.document["name"])
+    for field_name, field in model.model_fields.items():
+        # Indexed(str, unique=True) gibi alanlar Beanie tarafından "<alan>_<yön>" adıyla oluşturulur
+        indexed = getattr(field.annotation, "_indexed", None)
+        if indexed:
+            names.append(f"{field_name}_{indexed[0]}")
+    return names
+
+
+def undeclared_indexes() -> List[str]:
+    """Beklediği indeks modelde bildirilmemiş şekilleri döndürür (veritabanı gerektirmez)."""
+    return [
+        f"{shape.name}: index '{shape.index}' is not declared on {shape.model.__name__}"
+        for shape in QUERY_SHAPES
+        if shape.index not in declared_index_names(shape.model)
+    ]
+
+
+def _plan_stages(plan: Any) -> Iterator[Dict[str, Any]]:
+    """Explain planındaki tüm aşamaları (inputStage/inputStages/queryPlan iç içe) gezer."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+async def explain_shape(shape: QueryShape) -> Dict[str, Any]:
+    collection = shape.model.get_motor_collection()
+    cursor = collection.find(shape.filter)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    return await cursor.explain()
+
+
+def plan_problems(shape: QueryShape, explain: Dict[str, Any]) -> List[str]:
+    """
+    Kazanan planda COLLSCAN veya (izin verilmediyse) bellek içi SORT varsa raporlar.
+    Planlayıcı aynı şekli eşdeğer başka bir indeksle de karşılayabileceğinden indeks adı
+    burada değil, undeclared_indexes() ile statik olarak kontrol edilir.
+    """
+    winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    stages = list(_plan_stages(winning_plan))
+    problems = []
+    if any(stage["stage"] == "COLLSCAN" for stage in stages):
+        problems.append(f"{shape.name}: COLLSCAN")
+    if not shape.allow_in_memory_sort and any(stage["stage"] in ("SORT", "SORT_KEY_GENERATOR") for stage in stages):
+        problems.append(f"{shape.name}: in-memory SORT")
+    return problems
+
+
+async def verify_query_plans() -> List[str]:
+    """Tüm şekiller için statik kontrolü ve explain() doğrulamasını çalıştırır; sorunların listesini döner."""
+    problems = undeclared_indexes()
+    for shape in QUERY_SHAPES:
+        problems.extend(plan_problems(shape, await explain_shape(shape)))
+    return problems
+
+
+async def _main() -> int:
+    from app.core.db import close_db, init_db
+    from app.models import get_document_models
+
+    await init_db(document_models=get_document_models())
+    problems = await verify_query_plans()
+    await close_db()
+    for problem in problems:
+        print(f"QUERY PLAN PROBLEM: {problem}")
+    print(f"Checked {len(QUERY_SHAPES)} query shapes, {len(problems)} problem(s).")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
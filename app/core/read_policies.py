@@ -0,0 +1,103 @@
+# app/core/read_policies.py
+
+import time
+from typing import Dict, NamedTuple, Optional, Type
+
+from beanie import Document
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import _ServerMode, make_read_preference, read_pref_mode_from_name
+
+from .config import settings
+
+# Operasyon grubu başına okuma politikaları.
+# İstemcinin varsayılanı primary'dir (MONGO_URI'ye readPreference eklenmemelidir); Beanie'nin kendi
+# okumaları (Document.get, find_one, fetch_links) ve yazmalar her zaman bu varsayılanı kullanır. Politika
+# gerektiren okumalar ham motor koleksiyonunu collection_for(Model, POLICY) ile alır.
+#
+# Replica set üzerinde denemek için tek üyeli bir replica set yeterlidir:
+#   mongod --replSet rs0 --dbpath /tmp/rs0 && mongosh --eval "rs.initiate()"
+#   MONGO_URI=mongodb://localhost:27017/netflix_clone_db?replicaSet=rs0
+# İkincil üye yoksa secondaryPreferred okumaları primary'ye düşer; gönderilen $readPreference
+# benchmarks/check_read_policies.py ile kontrol edilir.
+
+CATALOG = "catalog" # İçerikler ve kategoriler: bayatlığa toleranslı
+USER = "user" # Kullanıcının kendi verisi: kendi yazmasını okumalı (read-your-writes)
+PRIMARY = "primary" # Her zaman primary: katalog yazmasından hemen sonraki okumalar ve varlık doğrulamaları
+
+
+class ReadPolicy(NamedTuple):
+    read_preference: _ServerMode
+    read_concern: ReadConcern
+
+
+def make_read_policy(mode: str, read_concern: str, max_staleness_seconds: int = -1) -> ReadPolicy:
+    """
+    Ayar değerlerinden politika kurar. Geçersiz mod adı ValueError, primary ile maxStaleness pymongo
+    ConfigurationError'ı verir (uygulama açılırken); 90 sn'den küçük bayatlık sınırı ilk okumada reddedilir.
+    """
+    try:
+        mode_value = read_pref_mode_from_name(mode)
+    except ValueError:
+        raise ValueError(f"Unknown read preference: {mode!r}") from None
+    return ReadPolicy(
+        read_preference=make_read_preference(mode_value, None, max_staleness_seconds),
+        read_concern=ReadConcern(read_concern or None), # Boş: sunucu varsayılanı
+    )
+
+
+READ_POLICIES: Dict[str, ReadPolicy] = {
+    CATALOG: make_read_policy(
+        settings.MONGO_CATALOG_READ_PREFERENCE,
+        settings.MONGO_CATALOG_READ_CONCERN,
+        settings.MONGO_CATALOG_MAX_STALENESS_SECONDS,
+    ),
+    USER: make_read_policy(settings.MONGO_USER_READ_PREFERENCE, settings.MONGO_USER_READ_CONCERN),
+    PRIMARY: make_read_policy("primary", settings.MONGO_CATALOG_READ_CONCERN),
+}
+
+# Bu süreçteki son katalog yazmasının zamanı (time.monotonic). Yazmadan sonraki MAX_STALENESS saniye
+# boyunca katalog okumaları primary'den yapılır; böylece geçersiz kılınan önbellek kayıtları henüz yazmayı
+# almamış bir ikincil üyeden (eski haliyle) yeniden doldurulmaz. Bayatlık sınırı yoksa (-1) 90 sn kullanılır.
+_last_catalog_write_at: Optional[float] = None
+
+
+def _catalog_write_window() -> float:
+    max_staleness = settings.MONGO_CATALOG_MAX_STALENESS_SECONDS
+    return float(max_staleness) if max_staleness > 0 else 90.0
+
+
+def note_catalog_write() -> None:
+    """Katalog yazmalarından sonra çağrılır (invalidate_catalog)."""
+    global _last_catalog_write_at
+    _last_catalog_write_at = time.monotonic()
+
+
+def forget_catalog_writes() -> None:
+    """Son yazma kaydını siler; katalog okumaları hemen CATALOG politikasına döner (benchmark/kontrol betikleri için)."""
+    global _last_catalog_write_at
+    _last_catalog_write_at = None
+
+
+def catalog_read_policy() -> str:
+    """Katalog okumalarının politikası: bu süreçte yakın zamanda katalog yazması olduysa PRIMARY, değilse CATALOG."""
+    if _last_catalog_write_at is not None and time.monotonic() - _last_catalog_write_at < _catalog_write_window():
+        return PRIMARY
+    return CATALOG
+
+
+def collection_for(model: Type[Document], policy: str) -> AsyncIOMotorCollection:
+    """Modelin motor koleksiyonunu verilen politikanın okuma tercihi ve read concern'üyle döndürür."""
+    read_policy = READ_POLICIES[policy]
+    return model.get_motor_collection().with_options(
+        read_preference=read_policy.read_preference,
+        read_concern=read_policy.read_concern,
+    )
+
+
+def read_policy_stats() -> Dict[str, dict]:
+    """Etkin politikalar (/health için)."""
+    return {
+        name: {"read_preference": policy.read_preference.document, "read_concern": policy.read_concern.level or "default"}
+        for name, policy in READ_POLICIES.items()
+    }
@@ -0,0 +1,54 @@
+# app/crud/catalog_state.py
+
+from typing import Optional
+from pymongo import ReturnDocument
+from app.models.catalog_state import CatalogStateDocument
+from app.utils.cache import drop_catalog_cache, invalidate_catalog
+from app.core.read_policies import PRIMARY, collection_for
+from app.crud import category as crud_category
+from app.crud import content as crud_content
+
+# Paylaşılan katalog versiyonu: catalog_state koleksiyonundaki tek dökümanda tutulur ve her içerik/kategori
+# yazmasında artırılır. Liste ETag'leri bu değerden türetildiğinden her worker aynı katalog için aynı ETag'i
+# üretir. Bir worker versiyonun kendi yazmaları dışında değiştiğini gördüğünde süreç içi katalog önbelleğini
+# bırakır, kategori kaydını ve öneri indeksini bayat işaretler; böylece yeni versiyonun ETag'i eski
+# (önbellekteki) bir gövdeyle gönderilmez.
+
+CATALOG_STATE_ID = "catalog"
+
+# Bu süreçte en son görülen versiyon (None: henüz okunmadı)
+_seen_version: Optional[int] = None
+
+async def _observe(version: int, own_write: bool = False) -> None:
+    global _seen_version
+    previous = _seen_version
+    if previous is not None and version <= previous:
+        return # Versiyon sadece artar; eş zamanlı bir okumanın geç dönen eski değeri yok sayılır
+    _seen_version = version
+    # Kendi yazmamız versiyonu tam bir artırır; fazlası başka bir worker'ın yazmasıdır
+    if previous is not None and version > previous + (1 if own_write else 0):
+        crud_category.category_registry.expire()
+        crud_content.suggest_index.expire()
+        await drop_catalog_cache()
+
+async def get_catalog_version() -> int:
+    """
+    Paylaşılan katalog versiyonu (tek dökümanlık _id okuması, primary'den: ikincil üyedeki eski
+    versiyon yazmayı gizlerdi). Başka bir worker'ın yazması görülürse yerel katalog önbellekleri bırakılır.
+    """
+    doc = await collection_for(CatalogStateDocument, PRIMARY).find_one({"_id": CATALOG_STATE_ID}, {"version": 1})
+    version = doc["version"] if doc else 0
+    await _observe(version)
+    return version
+
+async def publish_catalog_write(*tags: str) -> None:
+    """Katalog yazma yollarından çağrılır: bu süreçteki kayıtları geçersiz kılar ve paylaşılan versiyonu artırır."""
+    await invalidate_catalog(*tags)
+    doc = await CatalogStateDocument.get_motor_collection().find_one_and_update(
+        {"_id": CATALOG_STATE_ID},
+        {"$inc": {"version": 1}},
+        projection={"version": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    await _observe(doc["version"], own_write=True)
@@ -1,39 +1,84 @@
 # app/crud/category.py
 
 from typing import List, Optional
+from beanie import PydanticObjectId, UpdateResponse
 from beanie.odm.operators.update.general import Set
+from beanie.odm.utils.parsing import parse_obj
 from app.models.category import CategoryDocument
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.crud import catalog_state as crud_catalog_state
+from app.utils.category_registry import CategoryRegistry
+from app.core.config import settings
+from app.core.read_policies import PRIMARY, catalog_read_policy, collection_for
+
+# Tüm kategoriler bellekte: başlangıçta yüklenir, bu modüldeki yazmalarda güncellenir
+category_registry = CategoryRegistry(max_age_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+async def load_category_registry(policy: Optional[str] = None) -> dict:
+    """Tüm kategorileri okuyup kategori kaydını yeniden kurar (varsayılan: katalog okuma politikası)."""
+    cursor = collection_for(CategoryDocument, policy or catalog_read_policy()).find({})
+    category_registry.load([parse_obj(CategoryDocument, doc) async for doc in cursor])
+    return category_registry.stats()
+
+async def get_category_registry() -> CategoryRegistry:
+    # Diğer worker'lardaki yazmalar katalog önbelleğiyle aynı bayatlık sınırı içinde görülür
+    if category_registry.is_stale:
+        await load_category_registry()
+    return category_registry
 
 async def get_category(category_id: str) -> Optional[CategoryDocument]:
-    return await CategoryDocument.get(category_id)
+    return (await get_category_registry()).get(category_id)
 
 async def get_category_by_name(name: str) -> Optional[CategoryDocument]:
-    return await CategoryDocument.find_one(CategoryDocument.name == name)
+    return (await get_category_registry()).get_by_name(name)
 
 async def get_categories(skip: int = 0, limit: int = 100) -> List[CategoryDocument]:
-    return await CategoryDocument.find_all(skip=skip, limit=limit).to_list()
+    return (await get_category_registry()).all()[skip:skip + limit]
+
+async def find_missing_category_ids(category_ids: List[str]) -> List[str]:
+    """
+    Kayıtta olmayan kategori id'lerini döndürür. Bilinmeyen bir id başka bir worker'da yeni
+    oluşturulmuş olabileceğinden kayıt bir kez yeniden yüklenip tekrar kontrol edilir.
+    """
+    registry = await get_category_registry()
+    missing = registry.missing(category_ids)
+    if missing:
+        # Doğrulama için yeniden yükleme primary'den: yeni kategori ikincil üyeye henüz ulaşmamış olabilir
+        await load_category_registry(PRIMARY)
+        missing = registry.missing(missing)
+    return missing
 
 async def create_category(category_in: CategoryCreate) -> CategoryDocument:
     category = CategoryDocument(**category_in.model_dump())
     await category.insert()
+    category_registry.put(category)
+    await crud_catalog_state.publish_catalog_write("categories")
     return category
 
 async def update_category(category_id: str, category_in: CategoryUpdate) -> Optional[CategoryDocument]:
-    category = await CategoryDocument.get(category_id)
-    if not category:
-        return None
-    
     update_data = category_in.model_dump(exclude_unset=True)
     if not update_data: # Eğer güncellenecek bir şey yoksa
-        return category
+        return await get_category(category_id)
 
-    await category.update(Set(update_data))
-    return await CategoryDocument.get(category_id) # Güncellenmiş dökümanı getir
+    try:
+        category_object_id = PydanticObjectId(category_id)
+    except Exception:
+        return None
+    # Tek komut: güncelle ve güncellenmiş dökümanı döndür (find_one_and_update, AFTER); yoksa None
+    updated_category = await CategoryDocument.find_one(CategoryDocument.id == category_object_id).update(
+        Set(update_data), response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    if not updated_category:
+        return None
+    category_registry.put(updated_category)
+    await crud_catalog_state.publish_catalog_write("categories", f"category:{category_id}")
+    return updated_category
 
 async def delete_category(category_id: str) -> bool:
     category = await CategoryDocument.get(category_id)
     if category:
         await category.delete()
+        category_registry.remove(category.id)
+        await crud_catalog_state.publish_catalog_write("categories", f"category:{category_id}")
         return True
-    return False
\ No newline at end of file
+    return False
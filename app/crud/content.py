@@ -1,25 +1,112 @@
 # app/crud/content.py
 
 from typing import List, Optional
-from beanie import PydanticObjectId, Link
+from beanie import PydanticObjectId, Link, UpdateResponse
 from beanie.odm.operators.update.general import Set
-from beanie.odm.queries.find import FindMany # FindMany import edildi
+from beanie.odm.utils.parsing import parse_obj
 from app.models.content import ContentDocument
 from app.models.category import CategoryDocument
+from app.crud import category as crud_category
+from app.crud import catalog_state as crud_catalog_state
+from app.models.read_models import CONTENT_SUMMARY_PROJECTION, ContentSummary, PersonalizedContentSummary
 from app.schemas.content import ContentCreate, ContentUpdate
+from app.utils.pagination import InvalidCursorError, decode_cursor, keyset_filter, keyset_sort
+from app.utils.text_search import text_search_language
+from app.utils.prefix_index import PrefixIndex
+from app.utils.cache import cached, cached_many
+from app.core.config import settings
+from app.core.query_plans import parse_content_sort
+from app.core.read_policies import PRIMARY, catalog_read_policy, collection_for
 from datetime import datetime
-# import re # Regex için şu an kullanılmıyor
+import asyncio
 
+# Typeahead için süreç içi prefix indeksi: başlangıçta yüklenir, içerik yazımlarında güncellenir
+suggest_index = PrefixIndex(max_age_seconds=settings.SUGGEST_INDEX_MAX_AGE_SECONDS)
+_suggest_reload_lock = asyncio.Lock()
+
+async def load_suggest_index() -> dict:
+    """Tüm içeriklerin başlık/oyuncu/yönetmen alanlarını okuyup prefix indeksini yeniden kurar."""
+    cursor = collection_for(ContentDocument, catalog_read_policy()).find({}, {"title": 1, "starring": 1, "director": 1})
+    docs = [
+        (str(doc["_id"]), doc.get("title") or "", doc.get("starring"), doc.get("director"))
+        async for doc in cursor
+    ]
+    suggest_index.bulk_load(docs)
+    return suggest_index.stats()
+
+async def get_suggest_index() -> PrefixIndex:
+    # Diğer worker'lardaki içerik yazmaları indeks yeniden kurulduğunda görülür
+    if suggest_index.is_stale:
+        async with _suggest_reload_lock:
+            if suggest_index.is_stale: # Kilidi bekleyen istekler aynı yeniden kurmayı tekrarlamasın
+                await load_suggest_index()
+    return suggest_index
+
+async def suggest_contents(prefix: str, limit: int = 10) -> List[dict]:
+    return (await get_suggest_index()).search(prefix, limit=limit)
+
+def _index_for_suggest(content_doc: ContentDocument) -> None:
+    suggest_index.add(str(content_doc.id), content_doc.title, content_doc.starring, content_doc.director)
+
+def _content_tags(arguments: dict, content: Optional[ContentDocument]) -> List[str]:
+    # Tekil içerik, kendi id'si ve bağlı kategorilerinin id'leriyle etiketlenir (kategori adı değişirse geçersiz olur)
+    tags = [f"content:{arguments['content_id']}"]
+    if content and content.categories:
+        # Çözülmüş linkler CategoryDocument, çözülmemişler Link (id'si ref.id'de) olarak gelir
+        tags += [f"category:{cat.ref.id if isinstance(cat, Link) else cat.id}" for cat in content.categories]
+    return tags
+
+async def _find_content(query_filter: dict) -> Optional[ContentDocument]:
+    # Katalog okuma politikasıyla ham find_one; Beanie'nin fetch_links aggregate'i okuma tercihi almaz,
+    # kategori linkleri zaten bellekteki kategori kaydından çözülür
+    policy = catalog_read_policy()
+    doc = await collection_for(ContentDocument, policy).find_one(query_filter)
+    if doc is None and policy != PRIMARY:
+        # Başka bir worker'da az önce oluşturulmuş içerik ikincil üyeye henüz ulaşmamış olabilir;
+        # bulunamadı (ve önbellekte None) sonucu vermeden önce primary'de tekrar bakılır
+        doc = await collection_for(ContentDocument, PRIMARY).find_one(query_filter)
+    if doc is None:
+        return None
+    return _with_registry_categories(parse_obj(ContentDocument, doc), await crud_category.get_category_registry())
+
+@cached("content", tags=_content_tags)
 async def get_content(content_id: str) -> Optional[ContentDocument]:
-    return await ContentDocument.get(content_id, fetch_links=True)
+    try:
+        content_object_id = PydanticObjectId(content_id)
+    except Exception:
+        return None
+    return await _find_content({"_id": content_object_id})
 
 async def get_content_by_source_details(source_name: str, source_id: int) -> Optional[ContentDocument]:
-    return await ContentDocument.find_one(
-        ContentDocument.source_name == source_name,
-        ContentDocument.source_id == source_id,
-        fetch_links=True
-    )
+    return await _find_content({"source_name": source_name, "source_id": source_id})
+
+async def resolve_category_ids(category_name: str) -> List[PydanticObjectId]:
+    """
+    Kategori adını (büyük/küçük harf duyarsız) kategori ObjectId'lerine çevirir.
+    Çözümleme kategori kaydından yapılır; içerik sorgusu bu ID'ler üzerinden MongoDB tarafında filtrelenir.
+    """
+    registry = await crud_category.get_category_registry()
+    return registry.ids_for_name(category_name)
+
+async def _category_links(category_ids: List[str]) -> List[Link]:
+    """Kayıtta bulunan kategori id'lerinden link listesi kurar (veritabanına gidilmez; bilinmeyenler atlanır)."""
+    registry = await crud_category.get_category_registry()
+    return [
+        CategoryDocument.link_from_id(category.id)
+        for category in (registry.get(category_id) for category_id in category_ids)
+        if category is not None
+    ]
 
+def has_list_filter(
+    category_name: Optional[str] = None,
+    content_type: Optional[str] = None,
+    featured: Optional[bool] = None,
+    trending: Optional[bool] = None,
+) -> bool:
+    """Liste filtrelenmiş mi; filtreli listelerin varsayılan sıralaması puandır (parse_content_sort)."""
+    return bool(category_name or content_type) or featured is not None or trending is not None
+
+@cached("contents", tags=lambda arguments, _: ["contents", "categories"] if arguments["category_name"] else ["contents"])
 async def get_contents(
     skip: int = 0,
     limit: int = 10,
@@ -28,23 +115,34 @@ async def get_contents(
     featured: Optional[bool] = None,
     trending: Optional[bool] = None,
     sort_by: Optional[str] = None,
-    search_query: Optional[str] = None
-) -> List[ContentDocument]:
-    
+    search_query: Optional[str] = None,
+    cursor: Optional[str] = None,
+    search_language: Optional[str] = None
+) -> List[PersonalizedContentSummary]:
+    """
+    İçerikleri filtreler ve sayfalar. Sadece ContentPublicShort alanları motor koleksiyonundan
+    ham olarak okunur (projeksiyon) ve kullanıcı alanları boş (None) liste öğesi okuma modellerine
+    (PersonalizedContentSummary) maplenir; Beanie dökümanı oluşturulmaz.
+    cursor verilirse skip yerine keyset sayfalama kullanılır: (sıralama alanı, _id)
+    üzerinden indeksli aralık sorgusu yapılır.
+    Arama (search_query) ağırlıklı text indeksini kullanır; search_language verilirse
+    sorgu terimleri o dilin analizörüyle köklenir. Geçersiz cursor için InvalidCursorError fırlatır.
+    """
     query_filter = {} # MongoDB sorgu filtresi için bir dictionary
-    projection = None # Projeksiyon için (örn: textScore)
 
+    # Text araması var ve özel bir sıralama istenmiyorsa veya skora göre isteniyorsa alaka sıralaması
+    relevance_sort = bool(search_query) and (not sort_by or sort_by == "$textScore")
     if search_query:
         query_filter["$text"] = {"$search": search_query}
-        # Text araması yapılıyorsa ve özel bir sıralama istenmiyorsa veya skora göre isteniyorsa
-        if not sort_by or sort_by == "$textScore":
-            projection = {"score": {"$meta": "textScore"}}
-            sort_by_expression = [("score", {"$meta": "textScore"})] # PyMongo stili
-        else: # Arama var ama farklı bir sıralama isteniyor
-            sort_by_expression = None # sort_by parametresine göre aşağıda ayarlanacak
-    else: # Arama yok
-        sort_by_expression = None
+        if search_language:
+            query_filter["$text"]["$language"] = text_search_language(search_language)
 
+    if category_name:
+        category_ids = await resolve_category_ids(category_name)
+        if not category_ids:
+            return [] # Kategori bulunamadıysa boş liste
+        # Link alanları DBRef olarak saklanır; eşleşme categories.$id (multikey indeks) üzerinden yapılır
+        query_filter["categories.$id"] = {"$in": category_ids}
 
     if content_type:
         # query_filter[ContentDocument.content_type.name] = content_type.upper() # type: ignore
@@ -59,54 +157,112 @@ async def get_contents(
 
 
     # Sıralama ifadesini oluştur
-    if not search_query or (search_query and sort_by and sort_by != "$textScore"): # Eğer text araması yoksa veya varsa ama farklı bir sıralama isteniyorsa
-        if sort_by:
-            if sort_by.startswith("-"):
-                # sort_by_expression = ("-" + getattr(ContentDocument, sort_by[1:]).name) # type: ignore
-                sort_by_expression = [ (sort_by[1:], -1) ] # PyMongo stili
-            else:
-                try:
-                    # sort_by_expression = getattr(ContentDocument, sort_by).name # type: ignore
-                    sort_by_expression = [ (sort_by, 1) ] # PyMongo stili
-                except AttributeError:
-                    sort_by_expression = None # Geçersiz sıralama alanı
-        # Eğer search_query var ve sort_by $textScore değilse, MongoDB'nin doğal sıralaması ($text için) kullanılmaz.
-        # Bu durumda, sort_by_expression'ı yukarıdaki gibi ayarlamak doğru olur.
-
-
-    # Temel sorgu
-    find_query: FindMany[ContentDocument] = ContentDocument.find(query_filter, projection_model=projection, fetch_links=True)
-
-
-    if sort_by_expression:
-         find_query = find_query.sort(sort_by_expression)
-    
-    contents = await find_query.skip(skip).limit(limit).to_list()
-    
-    # Kategori adına göre Python tarafında filtreleme (Link yapısı nedeniyle, fetch_links=True ile çözülmeli)
-    if category_name:
-        category_doc_for_filter = await CategoryDocument.find_one(CategoryDocument.name == category_name)
-        if category_doc_for_filter:
-            filtered_contents = []
-            for content_item in contents:
-                if content_item.categories: # Kategoriler populate edilmiş olmalı (Link<CategoryDocument> ise)
-                    # Eğer content_item.categories List[CategoryDocument] ise (populate edilmişse)
-                    for cat_doc in content_item.categories: # cat_doc artık CategoryDocument nesnesi
-                        if cat_doc.name.lower() == category_name.lower():
-                            filtered_contents.append(content_item)
-                            break
-                # Eğer categories alanı List[Link[CategoryDocument]] ise ve populate edilmemişse, ID ile karşılaştırma gerekebilir:
-                # elif content_item.categories: # Kategoriler Link listesi ise
-                #     for cat_link in content_item.categories:
-                #         if cat_link.ref.id == category_doc_for_filter.id: # veya cat_link.id
-                #             filtered_contents.append(content_item)
-                #             break
-            return filtered_contents
-        else:
-            return [] # Kategori bulunamadıysa boş liste
-    
-    return contents
+    if relevance_sort:
+        if cursor:
+            raise InvalidCursorError("Cursor pagination is not supported for relevance-sorted search")
+        return await search_contents_by_relevance(query_filter, skip=skip, limit=limit)
+
+    # Sıralama _id ile kararlı hale getirilir, böylece cursor her sayfada aynı sırayı izler
+    sort_field, sort_direction = parse_content_sort(
+        sort_by, filtered=has_list_filter(category_name, content_type, featured, trending)
+    )
+    sort_by_expression = keyset_sort(sort_field, sort_direction)
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_field)
+        query_filter.update(keyset_filter(sort_field, sort_direction, sort_value, last_id))
+
+
+    # Temel sorgu: ContentPublicShort projeksiyonu (kategoriler dahil değil, linkler çözülmez;
+    # fetch_links=True filtreyi $lookup sonrasına taşır ve categories.$id eşleşmesini bozar)
+    find_cursor = collection_for(ContentDocument, catalog_read_policy()).find(query_filter, CONTENT_SUMMARY_PROJECTION)
+    find_cursor = find_cursor.sort(sort_by_expression)
+    if not cursor:
+        find_cursor = find_cursor.skip(skip)
+    return [PersonalizedContentSummary.from_bson(doc) for doc in await find_cursor.limit(limit).to_list(length=limit)]
+
+
+async def _load_content_summaries(content_ids: List[PydanticObjectId]) -> dict:
+    cursor = collection_for(ContentDocument, catalog_read_policy()).find({"_id": {"$in": content_ids}}, CONTENT_SUMMARY_PROJECTION)
+    return {doc["_id"]: ContentSummary.from_bson(doc) async for doc in cursor}
+
+async def get_content_summaries(content_ids: List[PydanticObjectId]) -> dict:
+    """
+    Verilen içeriklerin özetleri: {ObjectId: ContentSummary}. Özetler id başına katalog önbelleğinden okunur;
+    önbellekte olmayanlar tek bir projekte $in sorgusuyla yüklenir. İçerik güncellenince/silinince
+    (content:<id> etiketi) geçersiz olur. Bulunamayan (silinmiş) içerikler sonuçta yer almaz.
+    """
+    if not content_ids:
+        return {}
+    return await cached_many(
+        "content_summary", content_ids, _load_content_summaries, tags=lambda content_id: [f"content:{content_id}"]
+    )
+
 
+# Ana sayfa satırları: (anahtar, başlık, filtre). Kategori satırları çalışma anında eklenir.
+# Her satır query_plans.py'de bildirilmiş, puana göre sıralı indeksli bir şekildir.
+HOME_ROWS = [
+    ("featured", "Featured", {"featured": True}),
+    ("trending", "Trending Now", {"trending": True}),
+    ("movies", "Movies", {"content_type": "MOVIE"}),
+    ("tv_shows", "TV Shows", {"content_type": "TV_SHOW"}),
+]
+
+@cached("home_rows", tags=lambda arguments, _: ["contents", "categories"])
+async def get_home_rows(row_limit: int = 20, include_categories: bool = True) -> List[dict]:
+    """
+    Ana sayfanın tüm satırlarını tek çağrıda döndürür. Satır sorguları eşzamanlı çalışır;
+    $facet yerine ayrı sorgular seçildi çünkü $facet alt pipeline'ları indeks kullanamaz ve
+    koleksiyonun tamamını bellekte filtreler. Boş satırlar döndürülmez.
+    """
+    rows = list(HOME_ROWS)
+    if include_categories:
+        categories = (await crud_category.get_category_registry()).all()
+        rows += [(f"category:{cat.id}", cat.name, {"categories.$id": cat.id}) for cat in categories]
+
+    collection = collection_for(ContentDocument, catalog_read_policy())
+    row_docs = await asyncio.gather(*[
+        collection.find(row_filter, CONTENT_SUMMARY_PROJECTION)
+        .sort(keyset_sort("rating", -1))
+        .limit(row_limit)
+        .to_list(length=row_limit)
+        for _, _, row_filter in rows
+    ])
+    return [
+        {"key": key, "title": title, "items": [PersonalizedContentSummary.from_bson(doc) for doc in docs]}
+        for (key, title, _), docs in zip(rows, row_docs)
+        if docs
+    ]
+
+
+async def search_contents_by_relevance(query_filter: dict, skip: int = 0, limit: int = 10) -> List[PersonalizedContentSummary]:
+    """
+    $text eşleşmelerini alaka ve puanı harmanlayarak sıralar:
+    search_rank = textScore + SEARCH_RATING_WEIGHT * rating (puanı olmayanlar için 0).
+    $text eşleşmesi pipeline'ın ilk aşaması olmalıdır; sonuç ContentPublicShort alanlarına projekte edilir.
+    """
+    pipeline = [
+        {"$match": query_filter},
+        {"$addFields": {"search_rank": {"$add": [
+            {"$meta": "textScore"},
+            {"$multiply": [settings.SEARCH_RATING_WEIGHT, {"$ifNull": ["$rating", 0]}]},
+        ]}}},
+        {"$sort": {"search_rank": -1, "_id": 1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": CONTENT_SUMMARY_PROJECTION},
+    ]
+    docs = await collection_for(ContentDocument, catalog_read_policy()).aggregate(pipeline).to_list(length=limit)
+    return [PersonalizedContentSummary.from_bson(doc) for doc in docs]
+
+
+def _with_registry_categories(content_doc: ContentDocument, registry) -> ContentDocument:
+    """Kategori linklerini kayıttaki dökümanlarla değiştirir (fetch_links yerine, veritabanına gitmeden)."""
+    if content_doc.categories:
+        content_doc.categories = [
+            (registry.get(cat.ref.id) or cat) if isinstance(cat, Link) else cat
+            for cat in content_doc.categories
+        ]
+    return content_doc
 
 async def create_content(content_in: ContentCreate) -> ContentDocument:
     content_data = content_in.model_dump(exclude={"category_ids"})
@@ -114,56 +270,46 @@ async def create_content(content_in: ContentCreate) -> ContentDocument:
     content_data["time_created"] = current_time
     content_data["time_updated"] = current_time
 
-    category_docs_to_link = []
-    if content_in.category_ids:
-        for cat_id_str in content_in.category_ids:
-            try:
-                cat_object_id = PydanticObjectId(cat_id_str)
-                category = await CategoryDocument.get(cat_object_id)
-                if category:
-                    category_docs_to_link.append(category) # Doğrudan CategoryDocument nesnesini ekle
-            except Exception: 
-                # Geçersiz ID formatı veya bulunamayan kategori için loglama/hata yönetimi eklenebilir
-                pass 
-    
-    content_data["categories"] = category_docs_to_link
+    # Kategori linkleri kayıttan kurulur (router id'leri zaten find_missing_category_ids ile doğruladı)
+    content_data["categories"] = await _category_links(content_in.category_ids or [])
     
     content_doc = ContentDocument(**content_data)
     await content_doc.insert()
-    # insert sonrası ilişkili verileri de içeren dökümanı döndürmek için tekrar çek
-    return await get_content(str(content_doc.id))
+    _index_for_suggest(content_doc)
+    await crud_catalog_state.publish_catalog_write("contents")
+    # Eklenen döküman zaten elimizde; linkler tekrar okumak yerine kategori kaydından çözülür
+    return _with_registry_categories(content_doc, await crud_category.get_category_registry())
 
 async def update_content(content_id: str, content_in: ContentUpdate) -> Optional[ContentDocument]:
-    content_doc = await ContentDocument.get(content_id)
-    if not content_doc:
+    try:
+        content_object_id = PydanticObjectId(content_id)
+    except Exception:
         return None
 
     update_data = content_in.model_dump(exclude_unset=True, exclude={"category_ids"})
     update_data["time_updated"] = datetime.utcnow()
+    if "language" in update_data: # Text analizör dili language ile birlikte güncellenir
+        update_data["search_language"] = text_search_language(update_data["language"])
 
     if content_in.category_ids is not None: # Eğer category_ids alanı request'te varsa (boş liste dahil)
-        category_docs_to_link = []
-        if content_in.category_ids: # Eğer boş liste değilse
-            for cat_id_str in content_in.category_ids:
-                try:
-                    cat_object_id = PydanticObjectId(cat_id_str)
-                    category = await CategoryDocument.get(cat_object_id)
-                    if category:
-                        category_docs_to_link.append(category)
-                except Exception:
-                    pass
-        update_data["categories"] = category_docs_to_link # categories alanını tamamen güncelle
-    
-    # Eğer update_data boşsa ve categories alanı da güncellenmiyorsa, bir şey yapma
-    if not update_data and "categories" not in update_data:
-         return await get_content(content_id) # Mevcut dökümanı (linkleri çözülmüş) döndür
+        # categories alanını tamamen güncelle; $set içinde linkler DBRef olarak yazılır
+        update_data["categories"] = [link.ref for link in await _category_links(content_in.category_ids)]
 
-    await content_doc.update({"$set": update_data}) # $set operatörü ile güncelle
-    return await get_content(content_id) # Güncellenmiş ve ilişkili verileri çek
+    # Tek komut: güncelle ve güncellenmiş dökümanı döndür (find_one_and_update, AFTER); yoksa None
+    updated_content = await ContentDocument.find_one(ContentDocument.id == content_object_id).update(
+        Set(update_data), response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    if not updated_content:
+        return None
+    await crud_catalog_state.publish_catalog_write("contents", f"content:{content_id}")
+    _index_for_suggest(updated_content)
+    return _with_registry_categories(updated_content, await crud_category.get_category_registry())
 
 async def delete_content(content_id: str) -> bool:
     content_doc = await ContentDocument.get(content_id)
     if content_doc:
         await content_doc.delete()
+        suggest_index.remove(str(content_doc.id))
+        await crud_catalog_state.publish_catalog_write("contents", f"content:{content_id}")
         return True
     return False
\ No newline at end of file
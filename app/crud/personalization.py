@@ -0,0 +1,39 @@
+# app/crud/personalization.py
+
+import asyncio
+from typing import List, Sequence
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+
+from app.crud import watch_history as crud_watch_history
+from app.crud import watchlist as crud_watchlist
+from app.models.read_models import ContentSummary, PersonalizedContentSummary
+
+# Katalog listelerine kullanıcıya özel alanların (in_watchlist, progress_percentage) eklenmesi.
+# Katalog sayfaları kullanıcıdan bağımsız olarak önbelleklenir; kullanıcı durumu bunun üzerine sayfa başına
+# iki $in sorgusuyla (watchlist_items ve watch_history_items, eşzamanlı) eklenir. Öğe başına sorgu yapılmaz.
+
+
+async def personalize_contents(user_id: PydanticObjectId, items: Sequence[ContentSummary]) -> List[PersonalizedContentSummary]:
+    """İçerik özetlerini kullanıcının izleme listesi ve izleme ilerlemesiyle zenginleştirir (sıra korunur)."""
+    content_ids = list(dict.fromkeys(ObjectId(item.id) for item in items))
+    watchlisted, progress = await asyncio.gather(
+        crud_watchlist.get_watchlisted_content_ids(user_id, content_ids),
+        crud_watch_history.get_progress_for_contents(user_id, content_ids),
+    )
+    return [
+        item.with_user_state(ObjectId(item.id) in watchlisted, progress.get(ObjectId(item.id)))
+        for item in items
+    ]
+
+
+async def personalize_home_rows(user_id: PydanticObjectId, rows: List[dict]) -> List[dict]:
+    """Ana sayfa satırlarındaki tüm öğeleri tek seferde zenginleştirir (aynı içerik birden fazla satırda olabilir)."""
+    items = await personalize_contents(user_id, [item for row in rows for item in row["items"]])
+    personalized_rows, start = [], 0
+    for row in rows:
+        end = start + len(row["items"])
+        personalized_rows.append({**row, "items": items[start:end]})
+        start = end
+    return personalized_rows
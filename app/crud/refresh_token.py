@@ -0,0 +1,72 @@
+# app/crud/refresh_token.py
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+
+from app.models.refresh_token import RefreshTokenDocument
+from app.utils import token as token_utils
+
+# Rotasyonlu refresh token'lar.
+# Her giriş yeni bir token ailesi başlatır; POST /auth/refresh kullanılan token'ı tek bir atomik
+# find_one_and_update ile "kullanıldı" olarak işaretler ve aynı aileden yeni bir token verir. Yenileme
+# bcrypt yerine bir SHA-256 özeti ve (token_hash) benzersiz indeksinde tek bir sorgu maliyetindedir.
+# Kullanılmış bir token tekrar gelirse tüm aile iptal edilir (çalınan token'ın kullanılmasına karşı).
+# Süresi dolan kayıtları expires_at TTL indeksi siler.
+
+async def issue_refresh_token(user_id: PydanticObjectId, subject: str, family_id: Optional[str] = None) -> str:
+    """Yeni bir refresh token oluşturur ve özetini saklar; istemciye verilecek token'ı döndürür."""
+    refresh_token, token_hash = token_utils.create_refresh_token()
+    now = datetime.utcnow()
+    await RefreshTokenDocument(
+        token_hash=token_hash,
+        user_id=user_id,
+        subject=subject,
+        family_id=family_id or uuid.uuid4().hex,
+        created_at=now,
+        expires_at=now + timedelta(days=token_utils.REFRESH_TOKEN_EXPIRE_DAYS),
+    ).insert()
+    return refresh_token
+
+async def rotate_refresh_token(refresh_token: str) -> Optional[Tuple[PydanticObjectId, str, str]]:
+    """
+    Geçerli (bilinen, kullanılmamış, süresi dolmamış) token'ı kullanılmış olarak işaretler ve aynı aileden
+    yenisini verir: (user_id, subject, yeni token). Geçersizse None döner; token daha önce kullanılmışsa
+    ailenin tüm token'ları silinir.
+    """
+    token_hash = token_utils.hash_refresh_token(refresh_token)
+    now = datetime.utcnow()
+    collection = RefreshTokenDocument.get_motor_collection()
+    used = await collection.find_one_and_update(
+        {"token_hash": token_hash, "used_at": None, "expires_at": {"$gt": now}},
+        {"$set": {"used_at": now}},
+        projection={"user_id": 1, "subject": 1, "family_id": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if used is None:
+        # Sadece başarısız yolda: token yeniden mi kullanıldı?
+        reused = await collection.find_one({"token_hash": token_hash, "used_at": {"$ne": None}}, {"family_id": 1})
+        if reused is not None:
+            result = await collection.delete_many({"family_id": reused["family_id"]})
+            print(f"Refresh token reuse detected, revoked family {reused['family_id']} ({result.deleted_count} tokens)")
+        return None
+
+    new_refresh_token = await issue_refresh_token(used["user_id"], used["subject"], used["family_id"])
+    return used["user_id"], used["subject"], new_refresh_token
+
+async def revoke_refresh_token(refresh_token: str) -> bool:
+    """Token'ın ait olduğu aileyi (oturumu) iptal eder (çıkış). Token bilinmiyorsa False döner."""
+    collection = RefreshTokenDocument.get_motor_collection()
+    found = await collection.find_one({"token_hash": token_utils.hash_refresh_token(refresh_token)}, {"family_id": 1})
+    if found is None:
+        return False
+    await collection.delete_many({"family_id": found["family_id"]})
+    return True
+
+async def revoke_user_refresh_tokens(user_id: PydanticObjectId) -> int:
+    """Kullanıcının tüm refresh token'larını siler (şifre değişikliği, pasifleştirme); silinen sayısını döner."""
+    result = await RefreshTokenDocument.get_motor_collection().delete_many({"user_id": user_id})
+    return result.deleted_count
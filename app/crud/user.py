@@ -1,16 +1,65 @@
 # app/crud/user.py
 
 from typing import Optional
+from beanie import PydanticObjectId, UpdateResponse
 from beanie.odm.operators.update.general import Set # Set import edildi
 from datetime import datetime # datetime import edildi
 
 from app.models.user import UserDocument, UserPreferences, UserSecurity
+from app.models.read_models import PRINCIPAL_PROJECTION, Principal
 from app.schemas.user import UserCreate, UserProfileUpdate, UserPreferencesUpdate, UserPasswordUpdate
-from app.utils.security import get_password_hash, verify_password # verify_password eklendi
+from app.utils.security import get_password_hash_async, verify_password_async # Hashleme thread havuzunda, event loop bloklanmaz
+from app.utils.cache import InMemoryTaggedCache, _MISSING
+from app.crud import refresh_token as crud_refresh_token
+from app.core.config import settings
+from app.core.read_policies import USER, collection_for
+
+# Kimliği doğrulanmış kullanıcılar (principal) için süreç içi TTL + LRU önbellek.
+# Anahtar token'daki subject (email), etiket "user:<id>"; kullanıcıyı değiştiren yazmalar etiketi geçersiz kılar.
+principal_cache = InMemoryTaggedCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+# Her geçersiz kılmada artar; okuma sürerken geçersiz kılma olduysa okunan (eski olabilecek) kullanıcı önbelleğe yazılmaz
+_principal_epoch = 0
 
 async def get_user_by_email(email: str) -> Optional[UserDocument]:
     return await UserDocument.find_one(UserDocument.email == email)
 
+async def _load_principal(email: str) -> Optional[Principal]:
+    # Sadece kimlik doğrulaması için gereken alanlar okunur (email benzersiz indeksi üzerinden)
+    doc = await collection_for(UserDocument, USER).find_one({"email": email}, PRINCIPAL_PROJECTION)
+    return Principal.from_bson(doc) if doc is not None else None
+
+async def get_principal(email: str) -> Optional[Principal]:
+    """
+    İstek yolundaki kimlik doğrulaması için kullanıcının hafif görünümü: önbellekte varsa veritabanına gidilmez.
+    Principal değiştirilemez olduğundan istekler arasında güvenle paylaşılır. Bulunamayan kullanıcılar önbelleğe yazılmaz.
+    """
+    if not settings.PRINCIPAL_CACHE_ENABLED:
+        return await _load_principal(email)
+    principal = await principal_cache.get(email)
+    if principal is not _MISSING:
+        return principal
+    epoch = _principal_epoch
+    principal = await _load_principal(email)
+    if principal is not None and epoch == _principal_epoch:
+        await principal_cache.set(email, principal, [f"user:{principal.id}"])
+    return principal
+
+async def get_principal_by_id(user_id: PydanticObjectId) -> Optional[Principal]:
+    """
+    Kullanıcının hafif görünümü id ile (token yenileme): email değişse de kullanıcı bulunur.
+    Seyrek çağrıldığından önbelleğe alınmaz; _id indeksinde projekte tek sorgu.
+    """
+    doc = await collection_for(UserDocument, USER).find_one({"_id": user_id}, PRINCIPAL_PROJECTION)
+    return Principal.from_bson(doc) if doc is not None else None
+
+async def invalidate_principal(user_id) -> None:
+    """Kullanıcıyı değiştiren her yazmadan sonra çağrılır: önbellekteki principal kaydını siler."""
+    global _principal_epoch
+    _principal_epoch += 1
+    await principal_cache.invalidate_tags(f"user:{user_id}")
+
 async def get_user_by_username(username: str) -> Optional[UserDocument]:
     return await UserDocument.find_one(UserDocument.username == username)
 
@@ -18,7 +67,7 @@ async def get_user_by_id(user_id: str) -> Optional[UserDocument]: # ID ile kulla
     return await UserDocument.get(user_id)
 
 async def create_user(user_in: UserCreate) -> UserDocument:
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     
     user_data = user_in.model_dump(exclude={"password"})
     user_data["password"] = hashed_password
@@ -27,6 +76,14 @@ async def create_user(user_in: UserCreate) -> UserDocument:
     await db_user.insert()
     return db_user
 
+async def _update_and_return(user: UserDocument, update_data: dict) -> UserDocument:
+    """$set uygular ve güncellenmiş dökümanı tek komutla döndürür (find_one_and_update, AFTER)."""
+    updated_user = await UserDocument.find_one(UserDocument.id == user.id).update(
+        Set(update_data), response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    await invalidate_principal(user.id)
+    return updated_user or user
+
 async def update_user_profile(user: UserDocument, profile_in: UserProfileUpdate) -> UserDocument:
     update_data = {}
     
@@ -38,33 +95,56 @@ async def update_user_profile(user: UserDocument, profile_in: UserProfileUpdate)
         return user
 
     update_data["updated_at"] = datetime.utcnow()
-    
-    await user.update(Set(update_data))
-    return await UserDocument.get(user.id)
+    return await _update_and_return(user, update_data)
 
 async def update_user_preferences(user: UserDocument, preferences_in: UserPreferencesUpdate) -> UserDocument:
     update_data = {}
     
     if preferences_in.preferences is not None:
-        current_prefs = user.preferences.model_dump() if user.preferences else {}
-        updated_prefs = preferences_in.preferences.model_dump(exclude_unset=True)
-        current_prefs.update(updated_prefs)
-        update_data["preferences"] = UserPreferences(**current_prefs)
+        # Sadece gönderilen tercihler nokta yoluyla güncellenir; birleştirme veritabanında atomik olarak yapılır
+        updated_prefs = preferences_in.preferences.model_dump(mode="json", exclude_unset=True)
+        update_data.update({f"preferences.{key}": value for key, value in updated_prefs.items()})
 
     if not update_data:
         return user
 
     update_data["updated_at"] = datetime.utcnow()
-    await user.update(Set(update_data))
-    return await UserDocument.get(user.id)
+    return await _update_and_return(user, update_data)
 
 async def update_user_password(user: UserDocument, password_in: UserPasswordUpdate) -> bool:
-    if not verify_password(password_in.current_password, user.password):
+    if not await verify_password_async(password_in.current_password, user.password):
         return False
     
-    new_hashed_password = get_password_hash(password_in.new_password)
+    new_hashed_password = await get_password_hash_async(password_in.new_password)
     await user.update(Set({
         "password": new_hashed_password,
         "updated_at": datetime.utcnow()
     }))
-    return True
\ No newline at end of file
+    await invalidate_principal(user.id)
+    await crud_refresh_token.revoke_user_refresh_tokens(user.id) # Diğer oturumlar yeniden giriş yapmalı
+    return True
+
+async def update_last_login(user: UserDocument, new_password_hash: Optional[str] = None) -> None:
+    """last_login'i günceller; girişte şifre yeni maliyetle yeniden hashlendiyse aynı yazmada saklar."""
+    update_data = {"last_login": datetime.utcnow()}
+    if new_password_hash:
+        update_data["password"] = new_password_hash
+    # last_login ve şifre hash'i PRINCIPAL_PROJECTION'da olmadığından principal önbelleği geçersiz kılınmaz
+    await user.update(Set(update_data))
+
+async def set_user_active(user_id: str, is_active: bool) -> Optional[UserDocument]:
+    """
+    Yönetici kancası: kullanıcıyı aktif/pasif yapar ve principal önbelleğini hemen geçersiz kılar
+    (pasifleştirilen kullanıcı bu süreçte bir sonraki istekte reddedilir). Kullanıcı yoksa None döner.
+    """
+    try:
+        object_id = PydanticObjectId(user_id)
+    except Exception:
+        return None
+    updated_user = await UserDocument.find_one(UserDocument.id == object_id).update(
+        Set({"is_active": is_active, "updated_at": datetime.utcnow()}), response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    await invalidate_principal(object_id)
+    if updated_user is not None and not is_active:
+        await crud_refresh_token.revoke_user_refresh_tokens(object_id)
+    return updated_user
\ No newline at end of file
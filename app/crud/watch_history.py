@@ -1,14 +1,26 @@
 # app/crud/watch_history.py
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from beanie import PydanticObjectId, Link
-from beanie.odm.operators.update.general import Set
-from datetime import datetime
+from beanie.odm.utils.parsing import parse_obj
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from datetime import datetime, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
 
-from app.models.watch_history import WatchHistoryItemDocument
+from app.models.watch_history import (
+    WatchHistoryItemDocument, CONTINUE_WATCHING_MIN_PROGRESS, CONTINUE_WATCHING_MAX_PROGRESS
+)
 from app.models.user import UserDocument
 from app.models.content import ContentDocument
-from app.schemas.watch_history import WatchHistoryItemCreateOrUpdate
+from app.schemas.watch_history import WatchHistoryItemCreateOrUpdate, WatchProgressEvent
+from app.models.read_models import content_ref_ids, Principal, WatchHistoryItemRead
+from app.crud import content as crud_content
+from app.utils.pagination import decode_cursor, keyset_filter, keyset_sort, next_cursor_from_docs
+from app.utils.write_behind import PairKey, PendingProgress, WatchProgressBuffer
+from app.core.config import settings
+from app.core.read_policies import PRIMARY, USER, catalog_read_policy, collection_for
 
 async def get_watch_history_item(user_id: PydanticObjectId, content_id: PydanticObjectId) -> Optional[WatchHistoryItemDocument]:
     user_link = UserDocument.link_from_id(user_id)
@@ -19,50 +31,256 @@ async def get_watch_history_item(user_id: PydanticObjectId, content_id: Pydantic
         fetch_links=True
     )
 
+def _progress_upsert(user_id: PydanticObjectId, content_id: PydanticObjectId, progress_percentage: int, observed_at: datetime):
+    """(user, content) çifti için ilerleme upsert'inin (filtre, güncelleme) ikilisi."""
+    user_ref = UserDocument.link_from_id(user_id).ref
+    content_ref = ContentDocument.link_from_id(content_id).ref
+    return (
+        {"user": user_ref, "content": content_ref},
+        {
+            "$set": {"progress_percentage": progress_percentage, "last_watched_at": observed_at},
+            # Link alanları da açıkça yazılır (sorgudaki DBRef eşitliklerine güvenilmez)
+            "$setOnInsert": {"user": user_ref, "content": content_ref, "watched_at": observed_at}, # İlk izlenme
+        },
+    )
+
 async def add_or_update_watch_history(
-    user: UserDocument, 
+    user: Union[UserDocument, Principal], 
     content: ContentDocument, 
     progress_percentage: int
 ) -> WatchHistoryItemDocument:
-    existing_item = await get_watch_history_item(user.id, content.id)
-    current_time = datetime.utcnow()
-
-    if existing_item:
-        # Var olanı güncelle
-        await existing_item.update(
-            Set({
-                WatchHistoryItemDocument.progress_percentage: progress_percentage,
-                WatchHistoryItemDocument.last_watched_at: current_time
-            })
-        )
-        # Güncellenmiş dökümanı fetch_links ile tekrar çek
-        return await WatchHistoryItemDocument.get(existing_item.id, fetch_links=True)
-    else:
-        # Yeni oluştur
-        history_item = WatchHistoryItemDocument(
-            user=user, 
-            content=content,
-            progress_percentage=progress_percentage,
-            watched_at=current_time, # İlk izlenme
-            last_watched_at=current_time # Son izlenme (ilk izlenmeyle aynı)
+    """
+    Tek komut: (user, content) için upsert yapar ve güncel kaydı döndürür (find_one_and_update, AFTER).
+    Tamponda bu çift için bekleyen daha eski bir heartbeat varsa atılır.
+    """
+    if progress_buffer is not None:
+        progress_buffer.discard(user.id, content.id)
+    query_filter, update = _progress_upsert(user.id, content.id, progress_percentage, datetime.utcnow())
+    collection = WatchHistoryItemDocument.get_motor_collection()
+
+    async def upsert() -> dict:
+        return await collection.find_one_and_update(
+            query_filter, update, upsert=True, return_document=ReturnDocument.AFTER
         )
-        await history_item.insert()
-        return await WatchHistoryItemDocument.get(history_item.id, fetch_links=True)
 
+    try:
+        raw_item = await upsert()
+    except DuplicateKeyError:
+        # Eşzamanlı iki upsert'ten biri benzersiz indekse takılabilir; kayıt artık var, tekrar denemek onu günceller
+        raw_item = await upsert()
+    if progress_buffer is not None:
+        progress_buffer.remember_written(user.id, content.id, progress_percentage)
+    history_item = parse_obj(WatchHistoryItemDocument, raw_item)
+    history_item.content = content # İçerik zaten elimizde, linki tekrar çözmeye gerek yok
+    return history_item
+
+def _progress_bulk_operations(user_id: PydanticObjectId, content_id: PydanticObjectId, pending: PendingProgress) -> List[UpdateOne]:
+    """
+    Bir çiftin toplu yazma işlemleri. Kuyruktan geç gelen (observed_at'i kayıttakinden eski) olaylar
+    daha yeni ilerlemeyi ezmesin diye iki işlem kullanılır:
+    kayıt varsa ve daha eskiyse güncelle; kayıt yoksa bu değerlerle oluştur (varsa bir şey yapmaz).
+    """
+    query_filter, _ = _progress_upsert(user_id, content_id, pending.progress_percentage, pending.observed_at)
+    return [
+        UpdateOne(
+            {**query_filter, "$or": [{"last_watched_at": {"$lt": pending.observed_at}}, {"last_watched_at": None}]},
+            {"$set": {"progress_percentage": pending.progress_percentage, "last_watched_at": pending.observed_at}},
+        ),
+        UpdateOne(
+            query_filter,
+            {"$setOnInsert": {
+                **query_filter,
+                "progress_percentage": pending.progress_percentage,
+                "watched_at": pending.observed_at, # İlk izlenme
+                "last_watched_at": pending.observed_at,
+            }},
+            upsert=True,
+        ),
+    ]
+
+async def write_progress_batch(batch: Dict[PairKey, PendingProgress]) -> None:
+    """Birden çok (user, content) ilerlemesini tek bir sırasız bulk_write ile yazar."""
+    if not batch:
+        return
+    operations = [
+        operation
+        for (user_id, content_id), pending in batch.items()
+        for operation in _progress_bulk_operations(user_id, content_id, pending)
+    ]
+    collection = WatchHistoryItemDocument.get_motor_collection()
+    try:
+        await collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if not write_errors or e.details.get("writeConcernErrors") or any(error.get("code") != 11000 for error in write_errors):
+            raise
+        # Aynı çiftin eşzamanlı ilk yazmalarından birinin upsert'i benzersiz indekse takıldı (bkz.
+        # add_or_update_watch_history); kayıt artık var, o çiftlerin koşullu $set işlemi tekrar çalıştırılır
+        # (her çiftin işlemleri sırasıyla [koşullu $set, $setOnInsert upsert])
+        retry_operations = [operations[error["index"] // 2 * 2] for error in write_errors]
+        await collection.bulk_write(retry_operations, ordered=False)
+
+# Heartbeat write-behind tamponu (WATCH_PROGRESS_WRITE_BEHIND=true ise kurulur, main.py lifespan'ında başlatılır)
+progress_buffer: Optional[WatchProgressBuffer] = (
+    WatchProgressBuffer(
+        write_progress_batch,
+        flush_interval_seconds=settings.WATCH_PROGRESS_FLUSH_INTERVAL_SECONDS,
+        min_delta=settings.WATCH_PROGRESS_MIN_DELTA,
+        max_pending=settings.WATCH_PROGRESS_MAX_PENDING,
+    )
+    if settings.WATCH_PROGRESS_WRITE_BEHIND
+    else None
+)
+
+async def record_watch_progress(user_id: PydanticObjectId, content_id: PydanticObjectId, progress_percentage: int) -> bool:
+    """
+    Heartbeat ilerlemesini kaydeder: tampon açıksa bellekte birleştirilir (sonradan toplu yazılır),
+    değilse hemen tek bir upsert yapılır. Delta eşiği nedeniyle yazılmayacaksa False döner.
+    """
+    if progress_buffer is not None:
+        return progress_buffer.add(user_id, content_id, progress_percentage)
+    await write_progress_batch({(user_id, content_id): PendingProgress(progress_percentage, datetime.utcnow())})
+    return True
+
+
+async def apply_progress_events(user_id: PydanticObjectId, events: List[WatchProgressEvent]) -> dict:
+    """
+    Kuyruğa alınmış ilerleme olaylarını uygular: içerik başına en son (observed_at) olay tutulur,
+    tüm içerik id'leri tek bir $in sorgusuyla doğrulanır ve kalanlar tek bir bulk_write ile yazılır
+    (tampon açıksa tampona eklenir). Bilinmeyen veya geçersiz içerik id'leri raporlanır.
+    """
+    latest: Dict[str, PendingProgress] = {}
+    now = datetime.utcnow()
+    for event in events:
+        # Saat dilimi içeren zamanlar, kayıtlardaki gibi naive UTC'ye çevrilir
+        observed_at = event.observed_at
+        if observed_at.tzinfo is not None:
+            observed_at = observed_at.astimezone(timezone.utc).replace(tzinfo=None)
+        # İstemci saati ileride olabilir: gelecekteki bir last_watched_at, o zamana kadar tüm gerçek
+        # heartbeat'leri ($lt koşulu) reddeder ve izlemeye devam et sırasını bozar
+        observed_at = min(observed_at, now)
+        current = latest.get(event.content_id)
+        if current is None or observed_at >= current.observed_at:
+            latest[event.content_id] = PendingProgress(event.progress_percentage, observed_at)
+
+    object_ids = {}
+    for content_id in latest:
+        try:
+            object_ids[content_id] = ObjectId(content_id)
+        except (InvalidId, TypeError):
+            pass
+    existing_ids = set()
+    if object_ids:
+        policy = catalog_read_policy()
+        cursor = collection_for(ContentDocument, policy).find({"_id": {"$in": list(object_ids.values())}}, {"_id": 1})
+        existing_ids = {doc["_id"] async for doc in cursor}
+        unseen = [object_id for object_id in object_ids.values() if object_id not in existing_ids]
+        if unseen and policy != PRIMARY:
+            # Yeni oluşturulmuş içerik ikincil üyeye henüz ulaşmamış olabilir; bulunamayanlar primary'de tekrar kontrol edilir
+            cursor = collection_for(ContentDocument, PRIMARY).find({"_id": {"$in": unseen}}, {"_id": 1})
+            existing_ids.update([doc["_id"] async for doc in cursor])
+
+    batch: Dict[PairKey, PendingProgress] = {}
+    unknown_content_ids = []
+    for content_id, pending in latest.items():
+        object_id = object_ids.get(content_id)
+        if object_id not in existing_ids:
+            unknown_content_ids.append(content_id)
+            continue
+        batch[(user_id, object_id)] = pending
+
+    if progress_buffer is not None:
+        applied = sum(progress_buffer.add(uid, cid, p.progress_percentage, p.observed_at) for (uid, cid), p in batch.items())
+    else:
+        await write_progress_batch(batch)
+        applied = len(batch)
+    return {"received": len(events), "applied": applied, "unknown_content_ids": unknown_content_ids}
 
 async def remove_from_watch_history(user_id: PydanticObjectId, content_id: PydanticObjectId) -> bool:
-    item_to_delete = await get_watch_history_item(user_id, content_id)
-    if item_to_delete:
-        await item_to_delete.delete()
-        return True
-    return False
+    if progress_buffer is not None:
+        progress_buffer.discard(user_id, content_id) # Silinen kaydı bekleyen bir heartbeat yeniden oluşturmasın
+    # Tek delete_one: kaydı silmek için kullanıcı ve içerik dökümanlarının (fetch_links) okunmasına gerek yok
+    result = await WatchHistoryItemDocument.get_motor_collection().delete_one({
+        "user": UserDocument.link_from_id(user_id).ref,
+        "content": ContentDocument.link_from_id(content_id).ref,
+    })
+    return result.deleted_count > 0
 
-async def get_user_watch_history(user_id: PydanticObjectId, skip: int = 0, limit: int = 100) -> List[WatchHistoryItemDocument]:
-    user_link = UserDocument.link_from_id(user_id)
-    return await WatchHistoryItemDocument.find(
-        WatchHistoryItemDocument.user == user_link,
-        skip=skip,
-        limit=limit,
-        sort="-last_watched_at", # En son izlenenler üstte
-        fetch_links=True
-    ).to_list()
\ No newline at end of file
+async def _read_page(page_docs: List[dict], limit: int) -> Tuple[List[WatchHistoryItemRead], Optional[str]]:
+    """
+    Ham sayfa dökümanlarını okuma modellerine çevirir; içerikler tek bir projekte $in sorgusuyla çözülür.
+    (öğeler, sonraki sayfanın cursor'ı) döner; cursor ham sayfadan üretilir.
+    """
+    summaries = await crud_content.get_content_summaries(content_ref_ids(page_docs))
+    # Silinmiş içeriğe işaret eden öğeler atlanır (sayfa dolu olsa da eksik dönebilir, cursor yine üretilir)
+    items = [
+        WatchHistoryItemRead.from_bson(doc, summaries[doc["content"].id])
+        for doc in page_docs
+        if doc["content"].id in summaries
+    ]
+    return items, next_cursor_from_docs(page_docs, "last_watched_at", limit)
+
+async def get_user_watch_history(
+    user_id: PydanticObjectId,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[WatchHistoryItemRead], Optional[str]]:
+    """
+    Kullanıcının izleme geçmişini en son izlenenler üstte olacak şekilde döndürür: (öğeler, sonraki sayfanın cursor'ı veya None).
+    Sayfa, Beanie dökümanı oluşturulmadan ve linkler çözülmeden (user, last_watched_at, _id) indeksi üzerinden okunur;
+    cursor verilirse skip yerine keyset sayfalama kullanılır.
+    """
+    # Link alanları DBRef olarak saklanır; ham sorgu aynı DBRef ile (user, last_watched_at, _id) indeksini kullanır
+    query_filter = {"user": UserDocument.link_from_id(user_id).ref}
+    if cursor:
+        last_watched_at, last_id = decode_cursor(cursor, "last_watched_at")
+        query_filter.update(keyset_filter("last_watched_at", -1, last_watched_at, last_id))
+
+    page_cursor = collection_for(WatchHistoryItemDocument, USER).find(query_filter).sort(keyset_sort("last_watched_at", -1)) # En son izlenenler üstte
+    if not cursor:
+        page_cursor = page_cursor.skip(skip)
+    return await _read_page(await page_cursor.limit(limit).to_list(length=limit), limit)
+
+async def get_continue_watching(
+    user_id: PydanticObjectId,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[WatchHistoryItemRead], Optional[str]]:
+    """
+    Yarıda bırakılmış içerikleri (CONTINUE_WATCHING_MIN/MAX_PROGRESS aralığı) en son izlenen üstte döndürür: (öğeler, sonraki sayfanın cursor'ı veya None).
+    Filtre kısmi continue_watching_progress_idx indeksinin aralığıyla aynı olduğundan sorgu sadece o indeksi tarar;
+    içerik özetleri tek bir projekte $in sorgusuyla çözülür.
+    """
+    query_filter = {
+        "user": UserDocument.link_from_id(user_id).ref,
+        "progress_percentage": {"$gte": CONTINUE_WATCHING_MIN_PROGRESS, "$lte": CONTINUE_WATCHING_MAX_PROGRESS},
+    }
+    if cursor:
+        last_watched_at, last_id = decode_cursor(cursor, "last_watched_at")
+        query_filter.update(keyset_filter("last_watched_at", -1, last_watched_at, last_id))
+
+    page_cursor = collection_for(WatchHistoryItemDocument, USER).find(query_filter).sort(keyset_sort("last_watched_at", -1))
+    return await _read_page(await page_cursor.limit(limit).to_list(length=limit), limit)
+
+async def get_progress_for_contents(user_id: PydanticObjectId, content_ids: List[PydanticObjectId]) -> Dict[PydanticObjectId, int]:
+    """
+    Verilen içerikler için kullanıcının kaldığı yer (yüzde): {content_id: progress_percentage}.
+    (user, content) indeksinde tek bir $in sorgusu; tampon açıksa henüz yazılmamış daha yeni değerler üstüne yazılır.
+    """
+    if not content_ids:
+        return {}
+    cursor = collection_for(WatchHistoryItemDocument, USER).find(
+        {
+            "user": UserDocument.link_from_id(user_id).ref,
+            "content": {"$in": [ContentDocument.link_from_id(content_id).ref for content_id in content_ids]},
+        },
+        {"content": 1, "progress_percentage": 1, "_id": 0},
+    )
+    progress = {doc["content"].id: doc.get("progress_percentage", 0) async for doc in cursor}
+    if progress_buffer is not None:
+        for content_id in content_ids:
+            pending = progress_buffer.get(user_id, content_id)
+            if pending is not None:
+                progress[content_id] = pending.progress_percentage
+    return progress
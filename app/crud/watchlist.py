@@ -1,13 +1,19 @@
 # app/crud/watchlist.py
 
-from typing import List, Optional
-from beanie import PydanticObjectId, Link
+from typing import List, Optional, Set, Tuple, Union
+from beanie import PydanticObjectId, Link, UpdateResponse
+from beanie.odm.operators.update.general import SetOnInsert
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 
 from app.models.watchlist import WatchlistItemDocument
 from app.models.user import UserDocument
 from app.models.content import ContentDocument
 from app.schemas.watchlist import WatchlistItemCreate
+from app.models.read_models import content_ref_ids, Principal, WatchlistItemRead
+from app.crud import content as crud_content
+from app.utils.pagination import decode_cursor, keyset_filter, keyset_sort, next_cursor_from_docs
+from app.core.read_policies import USER, collection_for
 
 async def get_watchlist_item(user_id: PydanticObjectId, content_id: PydanticObjectId) -> Optional[WatchlistItemDocument]:
     # Kullanıcı ve içerik Link'lerini oluşturarak sorgulama
@@ -19,29 +25,82 @@ async def get_watchlist_item(user_id: PydanticObjectId, content_id: PydanticObje
         fetch_links=True # Content bilgisini de çek
     )
 
-async def add_to_watchlist(user: UserDocument, content: ContentDocument) -> Optional[WatchlistItemDocument]:
-    # Zaten var mı diye kontrol et (indeks sayesinde veritabanı seviyesinde de engellenir)
-    existing_item = await get_watchlist_item(user.id, content.id)
-    if existing_item:
-        return existing_item # Varsa mevcut olanı döndür
+async def add_to_watchlist(user: Union[UserDocument, Principal], content: ContentDocument) -> Optional[WatchlistItemDocument]:
+    # Tek komut: (user, content) için upsert; öğe zaten varsa added_at korunur ve mevcut öğe döner
+    user_ref = UserDocument.link_from_id(user.id).ref
+    content_ref = ContentDocument.link_from_id(content.id).ref
+    upsert_query = WatchlistItemDocument.find_one({"user": user_ref, "content": content_ref})
 
-    watchlist_item = WatchlistItemDocument(user=user, content=content) # Link'leri doğrudan model nesneleriyle oluştur
-    await watchlist_item.insert()
-    return await WatchlistItemDocument.get(watchlist_item.id, fetch_links=True)
+    async def upsert() -> Optional[WatchlistItemDocument]:
+        return await upsert_query.update(
+            # Link alanları da açıkça yazılır (sorgudaki DBRef eşitliklerine güvenilmez)
+            SetOnInsert({"user": user_ref, "content": content_ref, "added_at": datetime.utcnow()}),
+            upsert=True,
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    try:
+        watchlist_item = await upsert()
+    except DuplicateKeyError:
+        # Eşzamanlı iki upsert'ten biri benzersiz indekse takılabilir; öğe artık var, tekrar denemek onu döndürür
+        watchlist_item = await upsert()
+    if watchlist_item:
+        watchlist_item.content = content # İçerik zaten elimizde, linki tekrar çözmeye gerek yok
+    return watchlist_item
 
 async def remove_from_watchlist(user_id: PydanticObjectId, content_id: PydanticObjectId) -> bool:
-    item_to_delete = await get_watchlist_item(user_id, content_id)
-    if item_to_delete:
-        await item_to_delete.delete()
-        return True
-    return False
+    # Tek delete_one: öğeyi silmek için kullanıcı ve içerik dökümanlarının (fetch_links) okunmasına gerek yok
+    result = await WatchlistItemDocument.get_motor_collection().delete_one({
+        "user": UserDocument.link_from_id(user_id).ref,
+        "content": ContentDocument.link_from_id(content_id).ref,
+    })
+    return result.deleted_count > 0
 
-async def get_user_watchlist(user_id: PydanticObjectId, skip: int = 0, limit: int = 100) -> List[WatchlistItemDocument]:
-    user_link = UserDocument.link_from_id(user_id)
-    return await WatchlistItemDocument.find(
-        WatchlistItemDocument.user == user_link,
-        skip=skip,
-        limit=limit,
-        sort="-added_at", # En son eklenenler üstte
-        fetch_links=True # Content bilgisini de çek
-    ).to_list()
\ No newline at end of file
+async def _read_page(page_docs: List[dict], limit: int) -> Tuple[List[WatchlistItemRead], Optional[str]]:
+    """
+    Ham sayfa dökümanlarını okuma modellerine çevirir; içerikler tek bir projekte $in sorgusuyla çözülür.
+    (öğeler, sonraki sayfanın cursor'ı) döner; cursor ham sayfadan üretilir.
+    """
+    summaries = await crud_content.get_content_summaries(content_ref_ids(page_docs))
+    # Silinmiş içeriğe işaret eden öğeler atlanır (sayfa dolu olsa da eksik dönebilir, cursor yine üretilir)
+    items = [
+        WatchlistItemRead.from_bson(doc, summaries[doc["content"].id])
+        for doc in page_docs
+        if doc["content"].id in summaries
+    ]
+    return items, next_cursor_from_docs(page_docs, "added_at", limit)
+
+async def get_user_watchlist(
+    user_id: PydanticObjectId,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[WatchlistItemRead], Optional[str]]:
+    """
+    Kullanıcının izleme listesini en son eklenenler üstte olacak şekilde döndürür: (öğeler, sonraki sayfanın cursor'ı veya None).
+    Sayfa, Beanie dökümanı oluşturulmadan ve linkler çözülmeden (user, added_at, _id) indeksi üzerinden okunur; cursor
+    verilirse skip yerine keyset sayfalama kullanılır.
+    """
+    # Link alanları DBRef olarak saklanır; ham sorgu aynı DBRef ile (user, added_at, _id) indeksini kullanır
+    query_filter = {"user": UserDocument.link_from_id(user_id).ref}
+    if cursor:
+        added_at, last_id = decode_cursor(cursor, "added_at")
+        query_filter.update(keyset_filter("added_at", -1, added_at, last_id))
+
+    page_cursor = collection_for(WatchlistItemDocument, USER).find(query_filter).sort(keyset_sort("added_at", -1)) # En son eklenenler üstte
+    if not cursor:
+        page_cursor = page_cursor.skip(skip)
+    return await _read_page(await page_cursor.limit(limit).to_list(length=limit), limit)
+
+async def get_watchlisted_content_ids(user_id: PydanticObjectId, content_ids: List[PydanticObjectId]) -> Set[PydanticObjectId]:
+    """Verilen içeriklerden kullanıcının izleme listesinde olanlar; (user, content) indeksinde tek bir $in sorgusu."""
+    if not content_ids:
+        return set()
+    cursor = collection_for(WatchlistItemDocument, USER).find(
+        {
+            "user": UserDocument.link_from_id(user_id).ref,
+            "content": {"$in": [ContentDocument.link_from_id(content_id).ref for content_id in content_ids]},
+        },
+        {"content": 1, "_id": 0},
+    )
+    return {doc["content"].id async for doc in cursor}
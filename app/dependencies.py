@@ -1,6 +1,6 @@
 # app/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from typing import Optional
@@ -9,14 +9,18 @@ from app.utils import token as token_utils # JWT yardımcı fonksiyonlarımız
 from app.schemas.user import TokenData, UserPublic # Pydantic şemalarımız
 from app.crud import user as crud_user # Kullanıcı CRUD operasyonları
 from app.models.user import UserDocument # User modelimiz
+from app.models.read_models import Principal # İstek yolundaki hafif kullanıcı görünümü
 
 # OAuth2PasswordBearer, token'ı "Authorization: Bearer <token>" header'ından alır.
 # tokenUrl, frontend'in token almak için gideceği endpoint'i belirtir.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# Girişin isteğe bağlı olduğu endpoint'ler için: token yoksa 401 yerine None döner
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> Optional[UserDocument]:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
     """
-    Token'ı doğrular ve mevcut kullanıcıyı döndürür.
+    Token'ı doğrular ve mevcut kullanıcının hafif görünümünü (Principal: id, email, is_active ...) döndürür.
+    Tam UserDocument gereken endpoint'ler get_current_user_document kullanır.
     Eğer token geçersizse veya kullanıcı bulunamazsa HTTPException fırlatır.
     """
     credentials_exception = HTTPException(
@@ -35,32 +39,49 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Optional[User
     
     token_data = TokenData(email=email)
     
-    user = await crud_user.get_user_by_email(email=token_data.email)
+    # Principal önbelleğinden (isabet halinde veritabanına gidilmez)
+    user = await crud_user.get_principal(email=token_data.email)
     if user is None:
         raise credentials_exception
     return user
 
-async def get_current_active_user(current_user: UserDocument = Depends(get_current_user)) -> UserPublic:
+async def get_current_user_document(current_user: Principal = Depends(get_current_user)) -> UserDocument:
+    """
+    Tam kullanıcı dökümanı (profil, tercihler, şifre hash'i ...); sadece buna gerçekten ihtiyaç duyan
+    profil ve şifre endpoint'lerinde, kimlik doğrulamasından sonra id ile okunur.
+    """
+    user = await crud_user.get_user_by_id(current_user.id)
+    if user is None: # Token doğrulandıktan sonra silinmiş olabilir
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+async def get_personalization_user(
+    personalize: bool = Query(False, description="Add in_watchlist and progress_percentage for the authenticated user"),
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+) -> Optional[Principal]:
+    """
+    Kişiselleştirilebilen katalog endpoint'leri için kullanıcı. personalize=false ise token hiç doğrulanmaz:
+    anonim okumalar token çözme ve kullanıcı okuması maliyetini ödemez, süresi dolmuş token 401 almaz.
+    personalize=true ise token yoksa None döner, verildiyse get_current_user gibi doğrulanır (geçersizse 401).
+    """
+    if not personalize or token is None:
+        return None
+    return await get_current_user(token)
+
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """
     Mevcut kullanıcının aktif olup olmadığını kontrol eder.
     Eğer aktif değilse HTTPException fırlatır.
-    UserPublic şemasında döner (hassas bilgiler olmadan).
     """
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
-    
-    # UserDocument'tan UserPublic'e dönüşüm
-    return UserPublic(
-        id=str(current_user.id),
-        email=current_user.email,
-        full_name=current_user.full_name,
-        is_active=current_user.is_active,
-        is_superuser=current_user.is_superuser,
-        time_created=current_user.time_created,
-        time_updated=current_user.time_updated
-    )
+    return current_user
 
-async def get_current_active_superuser(current_user: UserDocument = Depends(get_current_user)) -> UserPublic:
+async def get_current_active_superuser(current_user: Principal = Depends(get_current_user)) -> Principal:
     """
     Mevcut kullanıcının aktif ve süper kullanıcı (admin) olup olmadığını kontrol eder.
     """
@@ -71,4 +92,4 @@ async def get_current_active_superuser(current_user: UserDocument = Depends(get_
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges",
         )
-    return UserPublic.model_validate(current_user) # Pydantic v2'de from_orm yerine model_validate
\ No newline at end of file
+    return current_user
@@ -5,13 +5,24 @@ from fastapi.middleware.cors import CORSMiddleware # CORS için import edildi
 from contextlib import asynccontextmanager
 import os
 
-from app.core.db import init_db
+from app.core.db import close_db, init_db
+from app.core.config import settings
+from app.core.query_plans import verify_query_plans
+from app.core.read_policies import read_policy_stats
+from app.utils import cache as cache_utils
+from app.utils import token as token_utils
+from app.utils import security as security_utils
 from app.models import get_document_models
+from app.crud import content as crud_content
+from app.crud import category as crud_category
+from app.crud import watch_history as crud_watch_history
+from app.crud import user as crud_user
 
 # Router'ları import et
 from app.routers import auth
 from app.routers import category
 from app.routers import content
+from app.routers import home
 from app.routers import users_interactions
 from app.routers import users_profile
 
@@ -22,9 +33,25 @@ async def lifespan(app_instance: FastAPI): # FastAPI instance'ını app_instance
     print("Application startup...")
     document_models = get_document_models() # Modelleri al
     await init_db(document_models=document_models) # Veritabanını ve Beanie'yi başlat
+    if settings.VERIFY_QUERY_PLANS: # Test modu: COLLSCAN veya bellek içi SORT yapan sorgu varsa başlama
+        problems = await verify_query_plans()
+        if problems:
+            raise RuntimeError("Query plan verification failed: " + "; ".join(problems))
+        print("Query plan verification passed.")
+    category_stats = await crud_category.load_category_registry() # Kategori kaydını belleğe yükle
+    print(f"Category registry loaded: {category_stats['categories']} categories")
+    suggest_stats = await crud_content.load_suggest_index() # Typeahead prefix indeksini yükle
+    print(f"Suggest index loaded: {suggest_stats['contents']} contents, {suggest_stats['entries']} entries, "
+          f"~{suggest_stats['memory_bytes'] / 1024:.0f} KiB")
+    if crud_watch_history.progress_buffer is not None: # Heartbeat write-behind tamponunu periyodik boşaltmaya başla
+        crud_watch_history.progress_buffer.start()
     yield
     # Uygulama kapanırken yapılacaklar
     print("Application shutdown...")
+    if crud_watch_history.progress_buffer is not None: # Bekleyen ilerlemeleri kaybetmeden yaz
+        await crud_watch_history.progress_buffer.stop()
+        print(f"Watch progress buffer flushed on shutdown: {crud_watch_history.progress_buffer.stats()}")
+    await close_db() # Bekleyen yazmalar bittikten sonra havuzu kapat
 
 # FastAPI uygulamasını oluştur
 app = FastAPI(
@@ -44,6 +71,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"], # Cursor ve ETag tarayıcıdan okunabilsin
 )
 
 
@@ -55,6 +83,7 @@ api_router_v1 = APIRouter(prefix="/api/v1") # v1 gibi bir versiyonlama da eklene
 api_router_v1.include_router(auth.router)
 api_router_v1.include_router(category.router)
 api_router_v1.include_router(content.router)
+api_router_v1.include_router(home.router)
 api_router_v1.include_router(users_interactions.router)
 api_router_v1.include_router(users_profile.router)
 
@@ -75,4 +104,15 @@ async def health_check():
     """
     Health check endpoint to verify if the API is running.
     """
-    return {"status": "healthy", "message": "API is up and running!"}
\ No newline at end of file
+    health = {
+        "status": "healthy",
+        "message": "API is up and running!",
+        "catalog_cache": cache_utils.catalog_cache.stats(),
+        "principal_cache": crud_user.principal_cache.stats(),
+        "token_cache": token_utils.verified_token_cache.stats(),
+        "password_hasher": security_utils.password_hasher_stats(),
+        "read_policies": read_policy_stats(),
+    }
+    if crud_watch_history.progress_buffer is not None:
+        health["watch_progress_buffer"] = crud_watch_history.progress_buffer.stats()
+    return health
\ No newline at end of file
@@ -8,6 +8,8 @@ from .category import CategoryDocument
 from .content import ContentDocument
 from .watchlist import WatchlistItemDocument # Yeni
 from .watch_history import WatchHistoryItemDocument # Yeni
+from .refresh_token import RefreshTokenDocument
+from .catalog_state import CatalogStateDocument
 
 def get_document_models() -> List[Type[BaseModel]]:
     models = [
@@ -16,5 +18,7 @@ def get_document_models() -> List[Type[BaseModel]]:
         ContentDocument,
         WatchlistItemDocument,      # Eklendi
         WatchHistoryItemDocument,   # Eklendi
+        RefreshTokenDocument,
+        CatalogStateDocument,
     ]
     return models
\ No newline at end of file
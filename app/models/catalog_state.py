@@ -0,0 +1,12 @@
+# app/models/catalog_state.py
+
+from beanie import Document
+
+class CatalogStateDocument(Document):
+    # Tek döküman (_id: "catalog"): her içerik/kategori yazmasında $inc ile artan katalog versiyonu.
+    # Tüm worker'lar aynı değeri okur; liste ETag'leri ve süreç içi katalog önbelleklerinin
+    # başka worker'lardaki yazmaları fark etmesi bu değere dayanır (app/crud/catalog_state.py)
+    version: int = 0
+
+    class Settings:
+        name = "catalog_state"
@@ -1,11 +1,12 @@
 # app/models/content.py
 
 from beanie import Document, Indexed, Link
-from pydantic import Field
+from pydantic import Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 from pymongo import IndexModel, TEXT # TEXT import edildi
 from .category import CategoryDocument # CategoryDocument modelini import ediyoruz
+from app.utils.text_search import text_search_language, DEFAULT_TEXT_SEARCH_LANGUAGE
 
 class ContentDocument(Document):
     # Frontend'deki dummyData.js'den gelen alanlar
@@ -28,6 +29,8 @@ class ContentDocument(Document):
     language: Optional[str] = None # Content language
     country: Optional[str] = None # Production country
     tags: Optional[List[str]] = Field(default_factory=list) # 'tags' alanı (string listesi)
+    # Text indeksinin language_override alanı (language'dan türetilir, örn: "turkish", "none")
+    search_language: Optional[str] = None
     
     content_type: str = Field(default="MOVIE") # "MOVIE" veya "TV_SHOW" olabilir (Enum yapılabilir)
 
@@ -48,11 +51,45 @@ class ContentDocument(Document):
 
     class Settings:
         name = "contents"
+        # Sorgu şekilleri ve explain doğrulaması: app/core/query_plans.py
         indexes = [
-            # Minimal indexes for now
-            IndexModel([("content_type", 1)], name="content_type_idx"),
-            IndexModel([("rating", -1)], name="rating_desc_idx")
+            # Liste sıralamaları: sıralama alanı + _id (keyset sayfalama, her iki yönde de taranabilir)
+            IndexModel([("rating", -1), ("_id", -1)], name="rating_id_idx"),
+            IndexModel([("title", 1), ("_id", 1)], name="title_id_idx"),
+            # Filtreli listeler ve satırlar (tür, öne çıkan, trend, kategori) puana (varsayılan) veya başlığa göre sıralı okunur
+            IndexModel([("content_type", 1), ("rating", -1), ("_id", -1)], name="content_type_rating_idx"),
+            IndexModel([("featured", 1), ("rating", -1), ("_id", -1)], name="featured_rating_idx"),
+            IndexModel([("trending", 1), ("rating", -1), ("_id", -1)], name="trending_rating_idx"),
+            IndexModel([("content_type", 1), ("title", 1), ("_id", 1)], name="content_type_title_idx"),
+            IndexModel([("featured", 1), ("title", 1), ("_id", 1)], name="featured_title_idx"),
+            IndexModel([("trending", 1), ("title", 1), ("_id", 1)], name="trending_title_idx"),
+            # Kategori filtresi: DBRef linklerinin $id alanı üzerinde multikey indeks
+            IndexModel([("categories.$id", 1), ("rating", -1), ("_id", -1)], name="categories_rating_idx"),
+            IndexModel([("categories.$id", 1), ("title", 1), ("_id", 1)], name="categories_title_idx"),
+            # get_content_by_source_details
+            IndexModel([("source_name", 1), ("source_id", 1)], name="source_idx"),
+            # /content?q= araması: ağırlıklı, dil duyarlı text indeksi (koleksiyon başına tek text indeksi olabilir)
+            IndexModel(
+                [
+                    ("title", TEXT),
+                    ("tags", TEXT),
+                    ("starring", TEXT),
+                    ("director", TEXT),
+                    ("description", TEXT),
+                ],
+                name="content_text_search_idx",
+                weights={"title": 10, "tags": 5, "starring": 5, "director": 5, "description": 1},
+                default_language=DEFAULT_TEXT_SEARCH_LANGUAGE,
+                language_override="search_language"
+            )
         ]
 
+    @model_validator(mode="after")
+    def fill_search_language(self):
+        # Seed script'leri gibi doğrudan insert edilen dökümanlarda da text analizör dili dolu olsun
+        if self.search_language is None:
+            self.search_language = text_search_language(self.language)
+        return self
+
     def __repr__(self) -> str:
         return f"<ContentDocument(id={self.id}, title='{self.title}')>"
\ No newline at end of file
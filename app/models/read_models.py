@@ -0,0 +1,152 @@
+# app/models/read_models.py
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Salt okunur endpoint'ler için hafif okuma modelleri.
+# Beanie dökümanları (Link sarmalayıcıları, revision durumu, doğrulama) yerine motor'dan gelen
+# ham dict'ler doğrudan bu __slots__ tabanlı, değiştirilemez nesnelere maplenir. Alan adları
+# app/schemas içindeki public şemalarla birebir aynıdır; to_dict() çıktısı o şemaların JSON'udur.
+# Değiştirilemez oldukları için katalog önbelleğinde güvenle paylaşılabilirler.
+
+_set = object.__setattr__
+
+
+class ReadModel:
+    __slots__ = ()
+    # Üst sınıflardakiler dahil tüm slot adları (alt sınıf tanımlanırken hesaplanır)
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ())
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and all(getattr(self, n) == getattr(other, n) for n in self._fields)
+
+    __hash__ = None # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} id={getattr(self, 'id', None)}>"
+
+
+# ContentPublicShort alanları (sırası şemayla aynı)
+CONTENT_SUMMARY_FIELDS = (
+    "id", "title", "description", "cover_image_url", "thumbnail_url", "video_url", "trailer_url",
+    "duration", "rating", "release_date", "content_type", "starring", "director", "language",
+    "country", "tags", "featured", "trending",
+)
+# motor find/aggregate için projeksiyon (_id her zaman gelir)
+CONTENT_SUMMARY_PROJECTION = {name: 1 for name in CONTENT_SUMMARY_FIELDS if name != "id"}
+
+# ContentDocument'taki varsayılanlar (alan dökümanda hiç yoksa)
+_CONTENT_DEFAULTS = {"content_type": "MOVIE", "featured": False, "trending": False, "starring": (), "tags": ()}
+
+
+class ContentSummary(ReadModel):
+    """ContentPublicShort'un okuma modeli (liste ve ana sayfa satırları, watchlist/geçmiş öğeleri)."""
+    __slots__ = CONTENT_SUMMARY_FIELDS
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any]) -> "ContentSummary":
+        self = cls.__new__(cls)
+        _set(self, "id", str(doc["_id"]))
+        for name in CONTENT_SUMMARY_FIELDS[1:]:
+            value = doc.get(name, _CONTENT_DEFAULTS.get(name))
+            _set(self, name, tuple(value) if isinstance(value, list) else value)
+        return self
+
+    def with_user_state(self, in_watchlist: bool, progress_percentage: Optional[int]) -> "PersonalizedContentSummary":
+        """Kullanıcıya özel alanlarla zenginleştirilmiş bir kopya döndürür (önbellekteki nesne değişmez)."""
+        personalized = PersonalizedContentSummary.__new__(PersonalizedContentSummary)
+        for name in CONTENT_SUMMARY_FIELDS:
+            _set(personalized, name, getattr(self, name))
+        _set(personalized, "in_watchlist", in_watchlist)
+        _set(personalized, "progress_percentage", progress_percentage)
+        return personalized
+
+
+class PersonalizedContentSummary(ContentSummary):
+    """
+    ContentListItem'ın okuma modeli: özet + izleme listesinde mi + kaldığı yer (yüzde).
+    Kişiselleştirilmemiş listeler de bu modeli kullanır (kullanıcı alanları None), böylece
+    yanıt her durumda ContentListItem'ın tüm alanlarını taşır.
+    """
+    __slots__ = ("in_watchlist", "progress_percentage")
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any]) -> "PersonalizedContentSummary":
+        self = super().from_bson(doc)
+        _set(self, "in_watchlist", None)
+        _set(self, "progress_percentage", None)
+        return self
+
+
+class WatchlistItemRead(ReadModel):
+    """WatchlistItemPublic'in okuma modeli."""
+    __slots__ = ("id", "user_id", "content", "added_at")
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any], content: ContentSummary) -> "WatchlistItemRead":
+        self = cls.__new__(cls)
+        _set(self, "id", str(doc["_id"]))
+        _set(self, "user_id", str(doc["user"].id))
+        _set(self, "content", content)
+        _set(self, "added_at", doc.get("added_at"))
+        return self
+
+
+class WatchHistoryItemRead(ReadModel):
+    """WatchHistoryItemPublic'in okuma modeli."""
+    __slots__ = ("id", "user_id", "content", "progress_percentage", "watched_at", "last_watched_at")
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any], content: ContentSummary) -> "WatchHistoryItemRead":
+        self = cls.__new__(cls)
+        _set(self, "id", str(doc["_id"]))
+        _set(self, "user_id", str(doc["user"].id))
+        _set(self, "content", content)
+        _set(self, "progress_percentage", doc.get("progress_percentage", 0))
+        _set(self, "watched_at", doc.get("watched_at"))
+        _set(self, "last_watched_at", doc.get("last_watched_at"))
+        return self
+
+
+# İstek yolundaki kimlik doğrulaması için kullanıcı alanları (devices, tercihler, şifre hash'i okunmaz)
+PRINCIPAL_PROJECTION = {"email": 1, "username": 1, "is_active": 1, "is_verified": 1, "is_superuser": 1, "subscription": 1}
+
+
+class Principal(ReadModel):
+    """
+    Kimliği doğrulanmış kullanıcının hafif görünümü (get_current_user). Tam UserDocument sadece
+    profil ve şifre endpoint'lerinde get_current_user_document ile okunur. id, CRUD fonksiyonlarına
+    doğrudan verilebilsin diye ObjectId olarak tutulur.
+    """
+    __slots__ = ("id", "email", "username", "is_active", "is_verified", "is_superuser", "subscription")
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any]) -> "Principal":
+        self = cls.__new__(cls)
+        _set(self, "id", doc["_id"])
+        _set(self, "email", doc["email"])
+        _set(self, "username", doc.get("username"))
+        _set(self, "is_active", doc.get("is_active", True))
+        _set(self, "is_verified", doc.get("is_verified", False))
+        _set(self, "is_superuser", doc.get("is_superuser", False)) # UserDocument'ta henüz yok; yoksa False
+        _set(self, "subscription", doc.get("subscription", "free"))
+        return self
+
+
+def content_ref_ids(docs: Sequence[Mapping[str, Any]]) -> List[Any]:
+    """Ham watchlist/geçmiş dökümanlarındaki content DBRef'lerinin id'leri (tekrarsız, sıra korunur)."""
+    return list(dict.fromkeys(doc["content"].id for doc in docs))
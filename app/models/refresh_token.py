@@ -0,0 +1,32 @@
+# app/models/refresh_token.py
+
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from typing import Optional
+from datetime import datetime
+from pymongo import IndexModel
+
+class RefreshTokenDocument(Document):
+    # Token'ın kendisi saklanmaz, sadece SHA-256 özeti (token yüksek entropili rastgele bir değer, bcrypt gerekmez)
+    token_hash: str
+    user_id: PydanticObjectId
+    subject: str # Verildiği andaki email (bilgi amaçlı; yenilemede kullanıcı user_id ile çözülür)
+    # Aynı girişten rotasyonla türeyen tüm token'lar aynı aileyi paylaşır; kullanılmış bir token tekrar
+    # gelirse (çalınmış olabilir) tüm aile iptal edilir
+    family_id: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+    used_at: Optional[datetime] = None # Rotasyonda kullanıldığı an
+
+    class Settings:
+        name = "refresh_tokens"
+        indexes = [
+            IndexModel([("token_hash", 1)], name="token_hash_unique_idx", unique=True),
+            IndexModel([("family_id", 1)], name="family_idx"),
+            IndexModel([("user_id", 1)], name="user_idx"),
+            # Süresi dolan token'ları MongoDB kendisi siler
+            IndexModel([("expires_at", 1)], name="expires_at_ttl_idx", expireAfterSeconds=0),
+        ]
+
+    def __repr__(self) -> str:
+        return f"<RefreshTokenDocument user_id={self.user_id} family_id={self.family_id} used={self.used_at is not None}>"
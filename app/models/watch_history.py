@@ -9,6 +9,11 @@ from pymongo import IndexModel # pymongo'dan IndexModel'i import et
 from .user import UserDocument
 from .content import ContentDocument
 
+# "İzlemeye devam et" satırına giren ilerleme aralığı (yüzde). continue_watching_progress_idx'in kısmi filtresiyle
+# aynıdır; sorgu bu aralığı içerdiği sürece kısmi indeks kullanılabilir
+CONTINUE_WATCHING_MIN_PROGRESS = 1
+CONTINUE_WATCHING_MAX_PROGRESS = 95
+
 class WatchHistoryItemDocument(Document):
     user: Link[UserDocument]
     content: Link[ContentDocument]
@@ -26,6 +31,31 @@ class WatchHistoryItemDocument(Document):
                 ],
                 name="user_content_history_unique_idx", # İndekse bir isim verelim
                 unique=True
+            ),
+            # Kullanıcının geçmişini last_watched_at'e göre (keyset) sayfalamak için
+            IndexModel(
+                [
+                    ("user", 1),
+                    ("last_watched_at", -1),
+                    ("_id", -1),
+                ],
+                name="user_last_watched_at_idx"
+            ),
+            # Sadece yarıda bırakılmış kayıtları içeren kısmi indeks (GET /users/me/continue-watching).
+            # Sondaki progress_percentage anahtarı, anahtar deseni user_last_watched_at_idx ile aynı olmasın
+            # diye eklenir (MongoDB 5.0 öncesi sadece partialFilterExpression'ı farklı iki indekse izin vermez);
+            # sıralama aynı önekle karşılanır, ilerleme filtresi indeks anahtarından kontrol edilir
+            IndexModel(
+                [
+                    ("user", 1),
+                    ("last_watched_at", -1),
+                    ("_id", -1),
+                    ("progress_percentage", 1),
+                ],
+                name="continue_watching_progress_idx",
+                partialFilterExpression={"progress_percentage": {
+                    "$gte": CONTINUE_WATCHING_MIN_PROGRESS, "$lte": CONTINUE_WATCHING_MAX_PROGRESS
+                }}
             )
         ]
 
@@ -25,6 +25,15 @@ class WatchlistItemDocument(Document):
                 ],
                 name="user_content_unique_idx", # İndekse bir isim verelim
                 unique=True
+            ),
+            # Kullanıcının listesini added_at'e göre (keyset) sayfalamak için
+            IndexModel(
+                [
+                    ("user", 1),
+                    ("added_at", -1),
+                    ("_id", -1),
+                ],
+                name="user_added_at_idx"
             )
         ]
     
@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm # Login formu için
 from datetime import timedelta
 
-from app.schemas.user import UserCreate, UserPublic, Token
+from app.schemas.user import UserCreate, UserPublic, Token, RefreshTokenRequest
 from app.crud import user as crud_user # CRUD operasyonları
+from app.crud import refresh_token as crud_refresh_token
 from app.utils import security, token # Yardımcı fonksiyonlar
 from app.models.user import UserDocument # User modelimiz
 
@@ -34,7 +35,10 @@ async def register_user(user_in: UserCreate):
             detail="Bu kullanıcı adı zaten kayıtlı.",
         )
         
-    created_user = await crud_user.create_user(user_in=user_in)
+    try:
+        created_user = await crud_user.create_user(user_in=user_in)
+    except security.PasswordHasherBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
     
     return UserPublic(
         id=str(created_user.id),
@@ -69,20 +73,66 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     if not user:
         user = await crud_user.get_user_by_username(username=form_data.username)
     
-    if not user or not security.verify_password(form_data.password, user.password):
+    password_ok, new_password_hash = False, None
+    if user:
+        try:
+            # bcrypt thread havuzunda çalışır; hash eski maliyetle oluşturulduysa yeni hash de döner
+            password_ok, new_password_hash = await security.verify_and_update_password_async(form_data.password, user.password)
+        except security.PasswordHasherBusyError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Kullanıcı adı/email veya şifre hatalı.",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Last login güncelle
-    from datetime import datetime
-    from beanie.odm.operators.update.general import Set
-    await user.update(Set({"last_login": datetime.utcnow()}))
+    # Last login güncelle (gerekirse yeniden hashlenmiş şifreyle birlikte, tek yazma)
+    await crud_user.update_last_login(user, new_password_hash=new_password_hash)
     
     access_token_expires = timedelta(minutes=token.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = token.create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    # Uzun oturumlar şifreyle (bcrypt) yeniden giriş yerine /auth/refresh ile yenilenir
+    refresh_token = await crud_refresh_token.issue_refresh_token(user.id, user.email)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshTokenRequest):
+    """
+    Refresh token'ı yeni bir access + refresh token çiftiyle değiştirir (rotasyon; eski token bir daha kullanılamaz).
+    Şifre doğrulaması yapılmaz: maliyet bir indeksli sorgu ve token imzalamadır.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    rotated = await crud_refresh_token.rotate_refresh_token(body.refresh_token)
+    if rotated is None:
+        raise invalid_exception
+    user_id, _, new_refresh_token = rotated
+
+    # Kullanıcı saklanan id ile çözülür (token verildikten sonra email değişmiş olabilir);
+    # silinmiş veya pasifleştirilmiş kullanıcılar yenileyemez
+    user = await crud_user.get_principal_by_id(user_id)
+    if user is None or not user.is_active:
+        await crud_refresh_token.revoke_user_refresh_tokens(user_id)
+        raise invalid_exception
+
+    # Yeni access token'ın sub'u kullanıcının güncel email'i
+    access_token = token.create_access_token(
+        data={"sub": user.email}, expires_delta=timedelta(minutes=token.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": new_refresh_token}
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(body: RefreshTokenRequest):
+    """
+    Refresh token'ın oturumunu (rotasyonla türeyen tüm token'ları) iptal eder.
+    Access token kısa ömürlüdür ve süresi dolana kadar geçerli kalır.
+    """
+    await crud_refresh_token.revoke_refresh_token(body.refresh_token)
+    return None
\ No newline at end of file
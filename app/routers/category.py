@@ -1,11 +1,14 @@
 # app/routers/category.py
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from typing import List
 from app.schemas.category import CategoryCreate, CategoryPublic, CategoryUpdate
 from app.crud import category as crud_category
+from app.crud import catalog_state as crud_catalog_state
 from app.dependencies import get_current_active_superuser # Güncellenmiş import
-from app.schemas.user import UserPublic # UserPublic şemasını da import et
+from app.models.read_models import Principal # Admin kontrolünden dönen hafif kullanıcı görünümü
+from app.utils.etag import catalog_list_etag, etag_matches, not_modified
+from app.utils.responses import trusted_json_response
 
 router = APIRouter(
     prefix="/categories",
@@ -15,7 +18,7 @@ router = APIRouter(
 @router.post("/", response_model=CategoryPublic, status_code=status.HTTP_201_CREATED)
 async def create_new_category(
     category_in: CategoryCreate,
-    current_user: UserPublic = Depends(get_current_active_superuser) # Admin yetkisi
+    current_user: Principal = Depends(get_current_active_superuser) # Admin yetkisi
 ):
     db_category = await crud_category.get_category_by_name(name=category_in.name)
     if db_category:
@@ -25,22 +28,29 @@ async def create_new_category(
     return CategoryPublic.model_validate(created_category)
 
 @router.get("/", response_model=List[CategoryPublic])
-async def read_categories(skip: int = 0, limit: int = 100):
+async def read_categories(request: Request, response: Response, skip: int = 0, limit: int = 100):
+    # Katalog değişmediyse liste sorgusu ve serileştirme yapmadan 304 dön
+    etag = catalog_list_etag(request, await crud_catalog_state.get_catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     categories = await crud_category.get_categories(skip=skip, limit=limit)
-    return [CategoryPublic.model_validate(cat) for cat in categories]
+    return trusted_json_response(
+        [CategoryPublic.model_validate(cat) for cat in categories], List[CategoryPublic], response=response
+    )
 
 @router.get("/{category_id}", response_model=CategoryPublic)
 async def read_category(category_id: str):
     category = await crud_category.get_category(category_id=category_id)
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
-    return CategoryPublic.model_validate(category)
+    return trusted_json_response(CategoryPublic.model_validate(category), CategoryPublic)
 
 @router.put("/{category_id}", response_model=CategoryPublic)
 async def update_existing_category(
     category_id: str,
     category_in: CategoryUpdate,
-    current_user: UserPublic = Depends(get_current_active_superuser) # Admin yetkisi
+    current_user: Principal = Depends(get_current_active_superuser) # Admin yetkisi
 ):
     # İsim güncelleniyorsa, yeni ismin başka bir kategoride kullanılmadığını kontrol et
     if category_in.name:
@@ -56,7 +66,7 @@ async def update_existing_category(
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_existing_category(
     category_id: str,
-    current_user: UserPublic = Depends(get_current_active_superuser) # Admin yetkisi
+    current_user: Principal = Depends(get_current_active_superuser) # Admin yetkisi
 ):
     # İsteğe bağlı: Bu kategoriyi kullanan içerikler varsa ne yapılacağına karar ver (örn: silmeyi engelle, içeriklerden kaldır)
     deleted = await crud_category.delete_category(category_id=category_id)
@@ -1,13 +1,20 @@
 # app/routers/content.py
 
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Request, Response
 from typing import List, Optional
-from app.schemas.content import ContentCreate, ContentPublic, ContentUpdate, ContentPublicShort
+from app.schemas.content import ContentCreate, ContentPublic, ContentUpdate, ContentPublicShort, ContentListItem, ContentSuggestion
 from app.crud import content as crud_content
 from app.crud import category as crud_category
-from app.dependencies import get_current_active_superuser # Dependency import
-from app.schemas.user import UserPublic # UserPublic import
+from app.crud import personalization as crud_personalization
+from app.crud import catalog_state as crud_catalog_state
+from app.dependencies import get_current_active_superuser, get_personalization_user # Dependency import
+from app.models.read_models import Principal
+from app.schemas.user import LanguageEnum
 from app.models.category import CategoryDocument # Kategori modeli import edildi
+from app.utils.pagination import InvalidCursorError, next_cursor
+from app.core.query_plans import CONTENT_SORT_PATTERN
+from app.utils.etag import catalog_list_etag, etag_matches, make_etag, not_modified
+from app.utils.responses import read_model_json_response, trusted_json_response
 
 router = APIRouter(
     prefix="/content",
@@ -17,51 +24,89 @@ router = APIRouter(
 @router.post("/", response_model=ContentPublic, status_code=status.HTTP_201_CREATED)
 async def create_new_content(
     content_in: ContentCreate,
-    current_user: UserPublic = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ):
     if content_in.category_ids:
-        for cat_id_str in content_in.category_ids:
-            category_doc = await crud_category.get_category(cat_id_str)
-            if not category_doc:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Category with id {cat_id_str} not found")
+        # Kategori kaydından doğrulanır (veritabanına gidilmez)
+        missing_ids = await crud_category.find_missing_category_ids(content_in.category_ids)
+        if missing_ids:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Category with id {missing_ids[0]} not found")
     
     created_content = await crud_content.create_content(content_in=content_in)
     return ContentPublic.model_validate(created_content)
 
 
-@router.get("/", response_model=List[ContentPublicShort])
+@router.get("/", response_model=List[ContentListItem])
 async def read_all_content(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
     category: Optional[str] = Query(None, description="Filter by category name (case-insensitive)"),
     type: Optional[str] = Query(None, description="Filter by content type (MOVIE, TV_SHOW) (case-insensitive)"),
     featured: Optional[bool] = Query(None, description="Filter by featured content"),
     trending: Optional[bool] = Query(None, description="Filter by trending content"),
-    sort_by: Optional[str] = Query(None, description="Sort by field (e.g., rating, -release_date, $textScore for search relevance)"),
-    q: Optional[str] = Query(None, min_length=2, description="Search query for title or description (case-insensitive, min 2 chars)")
+    sort_by: Optional[str] = Query(None, pattern=CONTENT_SORT_PATTERN, description="Sort by an index-backed field (rating, -rating, title, -title, $textScore for search relevance blended with rating)"),
+    q: Optional[str] = Query(None, min_length=2, description="Search query for title or description (case-insensitive, min 2 chars)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header (used instead of skip)"),
+    lang: Optional[LanguageEnum] = Query(None, description="Language used to stem the search query (tr, en, de, fr, es)"),
+    current_user: Optional[Principal] = Depends(get_personalization_user) # Sadece personalize=true ise çözülür
 ):
-    # CRUD fonksiyonu artık arama ve kategori filtrelemesini (Python tarafında) yapıyor
-    contents_from_db = await crud_content.get_contents(
-        skip=skip, limit=limit, category_name=category, content_type=type, sort_by=sort_by,
-        search_query=q, featured=featured, trending=trending
-    )
-            
-    # Convert ObjectId to string for each content item
-    result = []
-    for c in contents_from_db:
-        content_dict = c.model_dump()
-        content_dict["id"] = str(c.id)  # Convert ObjectId to string
-        result.append(ContentPublicShort.model_validate(content_dict))
-    return result
+    personalized = current_user is not None
+    if personalized:
+        # Yanıt kullanıcıya özel; katalog ETag'i kullanıcı durumunu kapsamadığından 304 verilmez
+        response.headers["Cache-Control"] = "private, no-cache"
+    else:
+        # Katalog değişmediyse liste sorgusu ve serileştirme yapmadan 304 dön
+        etag = catalog_list_etag(request, await crud_catalog_state.get_catalog_version())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+
+    # CRUD fonksiyonu arama ve kategori filtrelemesini MongoDB tarafında yapıyor
+    try:
+        contents_from_db = await crud_content.get_contents(
+            skip=skip, limit=limit, category_name=category, content_type=type, sort_by=sort_by,
+            search_query=q, featured=featured, trending=trending, cursor=cursor,
+            search_language=lang.value if lang else None
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Alaka sıralı aramada keyset sayfalama yapılamaz, diğer durumlarda sonraki sayfanın cursor'ı header'da döner
+    if not (q and (not sort_by or sort_by == "$textScore")):
+        sort_field, _ = crud_content.parse_content_sort(
+            sort_by, filtered=crud_content.has_list_filter(category, type, featured, trending)
+        )
+        next_page_cursor = next_cursor(contents_from_db, sort_field, limit)
+        if next_page_cursor:
+            response.headers["X-Next-Cursor"] = next_page_cursor
+
+    if personalized:
+        contents_from_db = await crud_personalization.personalize_contents(current_user.id, contents_from_db)
+
+    # get_contents ContentListItem alanlarını taşıyan okuma modelleri döndürüyor (kişiselleştirilmemişse
+    # in_watchlist/progress_percentage null); doğrudan byte'lara yaz
+    return read_model_json_response(contents_from_db, response=response)
+
+@router.get("/suggest", response_model=List[ContentSuggestion])
+async def suggest_content(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Typed prefix of a title, actor or director (diacritic-insensitive)"),
+    limit: int = Query(10, ge=1, le=25)
+):
+    # Süreç içi prefix indeksinden yanıtlanır; veritabanına sadece indeks bayatladığında gidilir
+    return await crud_content.suggest_contents(prefix, limit=limit)
 
 @router.get("/{content_id}", response_model=ContentPublicShort)
-async def read_single_content(content_id: str):
+async def read_single_content(content_id: str, request: Request, response: Response):
     content = await crud_content.get_content(content_id=content_id)
     if not content:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
-    content_dict = content.model_dump()
-    content_dict["id"] = str(content.id)  # Convert ObjectId to string
-    return ContentPublicShort.model_validate(content_dict)
+    etag = make_etag(str(content.id), content.time_updated or content.time_created)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return trusted_json_response(ContentPublicShort.model_validate(content), ContentPublicShort, response=response)
 
 
 @router.get("/source/{source_name}/{source_id}", response_model=ContentPublic)
@@ -69,21 +114,19 @@ async def read_content_by_source(source_name: str, source_id: int):
     content = await crud_content.get_content_by_source_details(source_name=source_name, source_id=source_id)
     if not content:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found by source details")
-    content_dict = content.model_dump()
-    content_dict["id"] = str(content.id)  # Convert ObjectId to string
-    return ContentPublic.model_validate(content_dict)
+    return trusted_json_response(ContentPublic.model_validate(content), ContentPublic)
 
 
 @router.put("/{content_id}", response_model=ContentPublic)
 async def update_existing_content(
     content_id: str,
     content_in: ContentUpdate,
-    current_user: UserPublic = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ):
     if content_in.category_ids:
-        for cat_id_str in content_in.category_ids:
-            if not await crud_category.get_category(cat_id_str):
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Category with id {cat_id_str} not found for update")
+        missing_ids = await crud_category.find_missing_category_ids(content_in.category_ids)
+        if missing_ids:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Category with id {missing_ids[0]} not found for update")
 
     updated_content = await crud_content.update_content(content_id=content_id, content_in=content_in)
     if not updated_content:
@@ -94,7 +137,7 @@ async def update_existing_content(
 @router.delete("/{content_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_existing_content(
     content_id: str,
-    current_user: UserPublic = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ):
     deleted = await crud_content.delete_content(content_id=content_id)
     if not deleted:
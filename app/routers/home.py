@@ -0,0 +1,35 @@
+# app/routers/home.py
+
+from fastapi import APIRouter, Depends, Query, Response
+from typing import Optional
+from app.schemas.content import HomePage
+from app.utils.responses import read_model_json_response
+from app.crud import content as crud_content
+from app.crud import personalization as crud_personalization
+from app.dependencies import get_personalization_user
+from app.models.read_models import Principal
+from app.core.config import settings
+
+router = APIRouter(
+    prefix="/home",
+    tags=["Home"]
+)
+
+@router.get("", response_model=HomePage)
+async def read_home_page(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=50, description="Items per row (defaults to HOME_ROW_LIMIT)"),
+    categories: bool = Query(True, description="Include one row per category"),
+    current_user: Optional[Principal] = Depends(get_personalization_user) # Sadece personalize=true ise çözülür
+):
+    """
+    Ana sayfanın tüm satırlarını (öne çıkan, trend, tür ve kategori satırları) tek istekte döndürür.
+    """
+    rows = await crud_content.get_home_rows(
+        row_limit=limit or settings.HOME_ROW_LIMIT, include_categories=categories
+    )
+    if current_user is not None:
+        # Satırlar önbellekten paylaşılır; kullanıcı durumu tüm satırlar için tek seferde eklenir
+        rows = await crud_personalization.personalize_home_rows(current_user.id, rows)
+        response.headers["Cache-Control"] = "private, no-cache"
+    return read_model_json_response({"rows": rows}, response=response)
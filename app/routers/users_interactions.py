@@ -1,17 +1,20 @@
 # app/routers/users_interactions.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from typing import List, Optional
 from beanie import PydanticObjectId
 
 from app.dependencies import get_current_user # Bu satır eklendi veya güncellendi (get_current_active_user yerine)
-from app.schemas.user import UserPublic # Bu zaten vardı, ama current_user için UserDocument kullanacağız
 from app.schemas.watchlist import WatchlistItemCreate, WatchlistItemPublic
-from app.schemas.watch_history import WatchHistoryItemCreateOrUpdate, WatchHistoryItemPublic
+from app.schemas.watch_history import (
+    WatchHistoryItemCreateOrUpdate, WatchHistoryItemPublic, WatchProgressBatch, WatchProgressBatchResult
+)
 from app.crud import watchlist as crud_watchlist
 from app.crud import watch_history as crud_watch_history
 from app.crud import content as crud_content # İçerik var mı diye kontrol için
-from app.models.user import UserDocument # current_user_doc'un tipini belirtmek için
+from app.models.read_models import Principal # current_user'un tipini belirtmek için (hafif kullanıcı görünümü)
+from app.utils.pagination import InvalidCursorError
+from app.utils.responses import read_model_json_response
 
 router = APIRouter(
     prefix="/users/me",
@@ -22,52 +25,50 @@ router = APIRouter(
 @router.post("/watchlist", response_model=WatchlistItemPublic, status_code=status.HTTP_201_CREATED)
 async def add_item_to_my_watchlist(
     item_in: WatchlistItemCreate,
-    current_user_doc: UserDocument = Depends(get_current_user) # Artık get_current_user import edildi
+    current_user: Principal = Depends(get_current_user) # Artık get_current_user import edildi
 ):
     content_doc = await crud_content.get_content(item_in.content_id)
     if not content_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found to add to watchlist")
     
-    watchlist_item = await crud_watchlist.add_to_watchlist(user=current_user_doc, content=content_doc)
+    watchlist_item = await crud_watchlist.add_to_watchlist(user=current_user, content=content_doc)
     if not watchlist_item:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not add item to watchlist")
 
-    # WatchlistItemPublic'e dönüşüm için content alanının doğru maplendiğinden emin olalım.
-    # crud_watchlist.add_to_watchlist zaten fetch_links=True ile dönüyor,
-    # bu yüzden watchlist_item.content bir ContentDocument olmalı.
-    # ContentPublicShort şeması, ContentDocument'tan alanları alabilmeli.
+    # crud_watchlist.add_to_watchlist tek bir upsert yapar ve content alanına zaten elimizdeki
+    # ContentDocument'ı koyar; ContentPublicShort şeması alanları ondan alır.
     return WatchlistItemPublic(
         id=str(watchlist_item.id),
-        user_id=str(current_user_doc.id),
+        user_id=str(current_user.id),
         content=watchlist_item.content, # Bu, Pydantic tarafından ContentPublicShort'a maplenecek
         added_at=watchlist_item.added_at
     )
 
 @router.get("/watchlist", response_model=List[WatchlistItemPublic])
 async def read_my_watchlist(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
-    current_user_doc: UserDocument = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header (used instead of skip)"),
+    current_user: Principal = Depends(get_current_user)
 ):
-    watchlist_items_db = await crud_watchlist.get_user_watchlist(user_id=current_user_doc.id, skip=skip, limit=limit)
-    
-    response_items = []
-    for item_db in watchlist_items_db:
-        # item_db.content bir ContentDocument nesnesi olmalı (fetch_links=True sayesinde)
-        response_items.append(
-            WatchlistItemPublic(
-                id=str(item_db.id),
-                user_id=str(current_user_doc.id),
-                content=item_db.content, # Pydantic, ContentDocument'ı ContentPublicShort'a mapleyecek
-                added_at=item_db.added_at
-            )
+    try:
+        watchlist_items_db, next_page_cursor = await crud_watchlist.get_user_watchlist(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
         )
-    return response_items
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_page_cursor:
+        response.headers["X-Next-Cursor"] = next_page_cursor
+    
+    # CRUD, WatchlistItemPublic alanlarını taşıyan okuma modelleri döndürüyor
+    return read_model_json_response(watchlist_items_db, response=response)
 
 @router.delete("/watchlist/{content_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_item_from_my_watchlist(
     content_id: str, # content_id'yi string olarak alalım
-    current_user_doc: UserDocument = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         # String ID'yi PydanticObjectId'ye çevirmeye gerek yok eğer CRUD fonksiyonu string kabul ediyorsa.
@@ -83,7 +84,7 @@ async def remove_item_from_my_watchlist(
     # Bu kontrol aslında CRUD içinde (get_watchlist_item) zaten dolaylı olarak yapılıyor.
     # Eğer content_id geçerli bir ObjectId değilse veya o ID'li içerik yoksa get_watchlist_item None döner.
 
-    deleted = await crud_watchlist.remove_from_watchlist(user_id=current_user_doc.id, content_id=content_object_id_for_check)
+    deleted = await crud_watchlist.remove_from_watchlist(user_id=current_user.id, content_id=content_object_id_for_check)
     if not deleted:
         # Bu, ya içerik watchlist'te değildi ya da bir sorun oluştu anlamına gelir.
         # get_watchlist_item None döndüğünde zaten false dönecek.
@@ -94,14 +95,14 @@ async def remove_item_from_my_watchlist(
 @router.post("/watch-history", response_model=WatchHistoryItemPublic, status_code=status.HTTP_200_OK)
 async def add_or_update_my_watch_history(
     item_in: WatchHistoryItemCreateOrUpdate,
-    current_user_doc: UserDocument = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     content_doc = await crud_content.get_content(item_in.content_id)
     if not content_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found to add to history")
     
     history_item = await crud_watch_history.add_or_update_watch_history(
-        user=current_user_doc, 
+        user=current_user, 
         content=content_doc, 
         progress_percentage=item_in.progress_percentage
     )
@@ -110,39 +111,86 @@ async def add_or_update_my_watch_history(
 
     return WatchHistoryItemPublic(
         id=str(history_item.id),
-        user_id=str(current_user_doc.id),
+        user_id=str(current_user.id),
         content=history_item.content,
         progress_percentage=history_item.progress_percentage,
         watched_at=history_item.watched_at,
         last_watched_at=history_item.last_watched_at
     )
 
+@router.post("/watch-history/heartbeat", status_code=status.HTTP_202_ACCEPTED)
+async def record_my_watch_progress(
+    item_in: WatchHistoryItemCreateOrUpdate,
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Oynatıcının periyodik ilerleme bildirimi. Kayıt döndürülmez; WATCH_PROGRESS_WRITE_BEHIND açıksa
+    ilerleme bellekte birleştirilip toplu yazılır, değilse hemen tek bir upsert yapılır.
+    """
+    content_doc = await crud_content.get_content(item_in.content_id) # Katalog önbelleğinden
+    if not content_doc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found to add to history")
+
+    await crud_watch_history.record_watch_progress(
+        user_id=current_user.id, content_id=content_doc.id, progress_percentage=item_in.progress_percentage
+    )
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+@router.post("/watch-history/batch", response_model=WatchProgressBatchResult)
+async def record_my_watch_progress_batch(
+    batch_in: WatchProgressBatch,
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Kuyruğa alınmış ilerleme olaylarını tek istekte uygular (TV uygulamaları, kesintili bağlantılar).
+    İçerik başına sadece en son observed_at'li olay yazılır; kayıttaki ilerlemeden eski olaylar onu ezmez.
+    Bulunamayan içerikler hata vermez, unknown_content_ids içinde döner.
+    """
+    result = await crud_watch_history.apply_progress_events(user_id=current_user.id, events=batch_in.events)
+    return WatchProgressBatchResult(**result)
+
 @router.get("/watch-history", response_model=List[WatchHistoryItemPublic])
 async def read_my_watch_history(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
-    current_user_doc: UserDocument = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header (used instead of skip)"),
+    current_user: Principal = Depends(get_current_user)
 ):
-    history_items_db = await crud_watch_history.get_user_watch_history(user_id=current_user_doc.id, skip=skip, limit=limit)
-    
-    response_items = []
-    for item_db in history_items_db:
-        response_items.append(
-             WatchHistoryItemPublic(
-                id=str(item_db.id),
-                user_id=str(current_user_doc.id),
-                content=item_db.content,
-                progress_percentage=item_db.progress_percentage,
-                watched_at=item_db.watched_at,
-                last_watched_at=item_db.last_watched_at
-            )
+    try:
+        history_items_db, next_page_cursor = await crud_watch_history.get_user_watch_history(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
         )
-    return response_items
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_page_cursor:
+        response.headers["X-Next-Cursor"] = next_page_cursor
+    
+    # CRUD, WatchHistoryItemPublic alanlarını taşıyan okuma modelleri döndürüyor
+    return read_model_json_response(history_items_db, response=response)
+
+@router.get("/continue-watching", response_model=List[WatchHistoryItemPublic])
+async def read_my_continue_watching(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Yarıda bırakılan içerikler (izlemeye devam et satırı), en son izlenen üstte."""
+    try:
+        items, next_page_cursor = await crud_watch_history.get_continue_watching(user_id=current_user.id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_page_cursor:
+        response.headers["X-Next-Cursor"] = next_page_cursor
+    return read_model_json_response(items, response=response)
 
 @router.delete("/watch-history/{content_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_item_from_my_watch_history(
     content_id: str, # content_id'yi string olarak alalım
-    current_user_doc: UserDocument = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         content_object_id_for_check = PydanticObjectId(content_id)
@@ -154,7 +202,7 @@ async def remove_item_from_my_watch_history(
     #     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found, cannot remove from history")
     # Bu kontrol de CRUD içinde dolaylı olarak var.
 
-    deleted = await crud_watch_history.remove_from_watch_history(user_id=current_user_doc.id, content_id=content_object_id_for_check)
+    deleted = await crud_watch_history.remove_from_watch_history(user_id=current_user.id, content_id=content_object_id_for_check)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found in watch history or content does not exist")
     return None
\ No newline at end of file
@@ -1,13 +1,16 @@
 # app/routers/users_profile.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
 from typing import Optional
 from datetime import datetime # datetime import edildi
 
-from app.dependencies import get_current_user # get_current_user yeterli, UserDocument döndürüyor
+from app.dependencies import get_current_user_document # Profil/şifre endpoint'leri tam UserDocument'a ihtiyaç duyar
 from app.schemas.user import UserPublic, UserProfileUpdate, UserPreferencesUpdate, UserPasswordUpdate
 from app.crud import user as crud_user
 from app.models.user import UserDocument # UserDocument'ı import et
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.responses import trusted_json_response
+from app.utils.security import PasswordHasherBusyError
 # Profil resmi yükleme için Cloudinary entegrasyonu (daha sonra eklenecek)
 # from app.utils import cloudinary_service 
 
@@ -18,20 +21,30 @@ router = APIRouter(
 
 @router.get("/profile", response_model=UserPublic)
 async def read_my_profile(
-    current_user_doc: UserDocument = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    current_user_doc: UserDocument = Depends(get_current_user_document)
 ):
     """
     Mevcut kullanıcının tüm profil bilgilerini döndürür.
+    If-None-Match ETag ile eşleşirse serileştirme yapmadan 304 döner.
     """
+    etag = make_etag(
+        str(current_user_doc.id), current_user_doc.updated_at, current_user_doc.version, current_user_doc.last_login
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache" # Kullanıcıya özel, her seferinde doğrulansın
     # UserDocument'tan UserPublic'e dönüşüm
     user_data = current_user_doc.model_dump()
     user_data["id"] = str(current_user_doc.id)
-    return UserPublic.model_validate(user_data)
+    return trusted_json_response(UserPublic.model_validate(user_data), UserPublic, response=response)
 
 @router.put("/profile", response_model=UserPublic)
 async def update_my_profile(
     profile_in: UserProfileUpdate,
-    current_user_doc: UserDocument = Depends(get_current_user)
+    current_user_doc: UserDocument = Depends(get_current_user_document)
 ):
     """
     Mevcut kullanıcının profil bilgilerini (isim, profil resmi URL'si, telefon vb.) günceller.
@@ -42,7 +55,7 @@ async def update_my_profile(
 @router.put("/preferences", response_model=UserPublic)
 async def update_my_preferences(
     preferences_in: UserPreferencesUpdate,
-    current_user_doc: UserDocument = Depends(get_current_user)
+    current_user_doc: UserDocument = Depends(get_current_user_document)
 ):
     """
     Mevcut kullanıcının bildirim ve oynatma tercihlerini günceller.
@@ -53,12 +66,15 @@ async def update_my_preferences(
 @router.put("/password", status_code=status.HTTP_204_NO_CONTENT)
 async def update_my_password(
     password_in: UserPasswordUpdate,
-    current_user_doc: UserDocument = Depends(get_current_user)
+    current_user_doc: UserDocument = Depends(get_current_user_document)
 ):
     """
     Mevcut kullanıcının şifresini günceller.
     """
-    success = await crud_user.update_user_password(user=current_user_doc, password_in=password_in)
+    try:
+        success = await crud_user.update_user_password(user=current_user_doc, password_in=password_in)
+    except PasswordHasherBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,7 +86,7 @@ async def update_my_password(
 # @router.post("/profile/avatar", response_model=UserPublic)
 # async def upload_my_profile_avatar(
 #     file: UploadFile = File(...),
-#     current_user_doc: UserDocument = Depends(get_current_user)
+#     current_user_doc: UserDocument = Depends(get_current_user_document)
 # ):
 #     # Burada dosyayı kaydetme veya Cloudinary'e yükleme mantığı olacak
 #     # Örnek:
@@ -3,6 +3,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from .common import ObjectIdStr
 
 # Temel Kategori Şeması (veritabanından okuma için)
 class CategoryBase(BaseModel):
@@ -24,7 +25,7 @@ class CategoryUpdate(BaseModel):
 
 # API'den Dönen Kategori Şeması
 class CategoryPublic(CategoryBase):
-    id: str # MongoDB _id
+    id: ObjectIdStr # MongoDB _id
     time_created: datetime
     time_updated: Optional[datetime] = None
 
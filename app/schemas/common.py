@@ -0,0 +1,10 @@
+# app/schemas/common.py
+
+from typing import Annotated
+from bson import ObjectId
+from pydantic import BeforeValidator
+
+# MongoDB ObjectId'yi API'de string olarak döndürmek için tip.
+# Şemalar Beanie dökümanlarından (from_attributes) veya ham dökümanlardan doğrulanırken
+# gelen ObjectId/PydanticObjectId değerleri string'e çevrilir.
+ObjectIdStr = Annotated[str, BeforeValidator(lambda value: str(value) if isinstance(value, ObjectId) else value)]
@@ -1,9 +1,10 @@
 # app/schemas/content.py
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from .category import CategoryPublic # Kategori şemasını import et
+from .common import ObjectIdStr
 
 # Temel İçerik Şeması
 class ContentBase(BaseModel):
@@ -58,7 +59,7 @@ class ContentUpdate(BaseModel):
 
 # API'den Dönen İçerik Şeması (Detaylı)
 class ContentPublic(ContentBase):
-    id: str # MongoDB _id
+    id: ObjectIdStr # MongoDB _id
     # Link ile bağladığımız kategorileri doğrudan CategoryPublic şemasıyla döndürebiliriz
     categories: Optional[List[CategoryPublic]] = Field(default_factory=list)
     time_created: datetime
@@ -68,8 +69,10 @@ class ContentPublic(ContentBase):
         from_attributes = True
 
 # Listeleme için daha kısa bir içerik şeması (opsiyonel)
+# Aynı zamanda liste sorgularında Beanie projeksiyon modeli olarak kullanılır:
+# MongoDB'den sadece bu alanlar okunur ve ham döküman (_id ile) doğrudan bu şemaya çevrilir.
 class ContentPublicShort(BaseModel):
-    id: str
+    id: ObjectIdStr = Field(validation_alias=AliasChoices("id", "_id"))
     title: str
     description: Optional[str] = None
     cover_image_url: Optional[str] = None
@@ -89,4 +92,25 @@ class ContentPublicShort(BaseModel):
     trending: bool = False
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Liste öğesi: personalize=true ile giriş yapmış kullanıcıya özel alanlar da doldurulur
+class ContentListItem(ContentPublicShort):
+    in_watchlist: Optional[bool] = None
+    progress_percentage: Optional[int] = None # İzleme geçmişinde yoksa None
+
+# Typeahead (/content/suggest) öneri şeması
+class ContentSuggestion(BaseModel):
+    id: str
+    title: str
+    matched_field: str # "title", "starring" veya "director"
+    matched_text: str # Eşleşen orijinal metin (örn: oyuncu adı)
+
+# Ana sayfa (/home) satır şemaları
+class HomeRow(BaseModel):
+    key: str # "featured", "trending", "movies", "tv_shows" veya "category:<id>"
+    title: str
+    items: List[ContentListItem]
+
+class HomePage(BaseModel):
+    rows: List[HomeRow]
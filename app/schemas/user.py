@@ -4,6 +4,7 @@ from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
+from .common import ObjectIdStr
 
 class LanguageEnum(str, Enum):
     tr = "tr"
@@ -45,7 +46,7 @@ class UserCreate(BaseModel):
     subscription: Literal["free", "basic", "premium"] = "free" 
 
 class UserPublic(BaseModel):
-    id: str
+    id: ObjectIdStr
     username: str
     email: EmailStr
     first_name: str
@@ -77,6 +78,10 @@ class UserPublic(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None # POST /auth/refresh ile yeni token çifti almak için
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
     email: Optional[EmailStr] = None
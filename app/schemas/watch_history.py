@@ -1,7 +1,7 @@
 # app/schemas/watch_history.py
 
 from pydantic import BaseModel, Field, conint
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from .content import ContentPublicShort
 
@@ -20,4 +20,20 @@ class WatchHistoryItemPublic(BaseModel):
     last_watched_at: Optional[datetime] = None # Son izlenme tarihi
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Toplu ilerleme gönderimi (POST /users/me/watch-history/batch)
+WATCH_PROGRESS_BATCH_MAX_EVENTS = 500
+
+class WatchProgressEvent(BaseModel):
+    content_id: str
+    progress_percentage: conint(ge=0, le=100)
+    observed_at: datetime # Oynatıcıda ilerlemenin gözlendiği an (kuyruktan geç gelebilir)
+
+class WatchProgressBatch(BaseModel):
+    events: List[WatchProgressEvent] = Field(..., min_length=1, max_length=WATCH_PROGRESS_BATCH_MAX_EVENTS)
+
+class WatchProgressBatchResult(BaseModel):
+    received: int # Gönderilen olay sayısı
+    applied: int # Yazılan (veya tampona alınan) içerik sayısı; içerik başına sadece en son olay uygulanır
+    unknown_content_ids: List[str] = Field(default_factory=list)
@@ -0,0 +1,210 @@
+# app/utils/cache.py
+
+import functools
+from abc import ABC, abstractmethod
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Set, Tuple
+
+from app.core.config import settings
+from app.core.read_policies import note_catalog_write
+
+# CRUD okumaları için etiketli (tag) önbellek.
+# Her kayıt bir veya daha fazla etiket taşır (örn: "contents", "content:<id>", "category:<id>");
+# yazma işlemleri sadece etkiledikleri etiketleri geçersiz kılar. Arka uç takılabilir:
+# CacheBackend arayüzünü uygulayan başka bir sınıf (örn: Redis) set_catalog_cache ile kullanılabilir.
+
+_MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Önbellek arka uç arayüzü. Metotlar async'tir ki ağ üzerinden çalışan arka uçlar da takılabilsin."""
+
+    @abstractmethod
+    async def get(self, key: Hashable) -> Any:
+        """Kayıt varsa değerini, yoksa _MISSING döndürür."""
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, tags: Iterable[str]) -> None:
+        """Değeri etiketleriyle birlikte kaydeder."""
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Etiketlerden herhangi birini taşıyan kayıtları siler, silinen kayıt sayısını döner."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Tüm kayıtları siler."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Sayaçlar (/health için)."""
+
+
+class InMemoryTaggedCache(CacheBackend):
+    """Süreç içi TTL + boyut sınırlı LRU önbellek; isabet/ıska/tahliye sayaçları tutar."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0 # LRU boyut sınırı nedeniyle atılanlar
+        self.expirations = 0 # TTL dolduğu için atılanlar
+        self.invalidations = 0 # Etiket geçersiz kılma ile silinenler
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    async def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        if entry[0] <= time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: Hashable, value: Any, tags: Iterable[str]) -> None:
+        if key in self._entries:
+            self._drop(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        keys = set()
+        for tag in tags:
+            keys |= self._keys_by_tag.get(tag, set())
+        for key in keys:
+            if key in self._entries:
+                self._drop(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+catalog_cache: CacheBackend = InMemoryTaggedCache(
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES, ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS
+)
+
+def set_catalog_cache(backend: CacheBackend) -> None:
+    """Katalog önbelleğinin arka ucunu değiştirir (örn: Redis tabanlı bir uygulama)."""
+    global catalog_cache
+    catalog_cache = backend
+
+# Katalog versiyonu: her geçersiz kılmada artar; okuma sürerken bir yazma olduysa okunan (eski olabilecek) değer önbelleğe yazılmaz
+_invalidation_epoch = 0
+
+async def invalidate_catalog(*tags: str) -> None:
+    """Yazma yollarından çağrılır: etiketleri taşıyan katalog kayıtlarını geçersiz kılar."""
+    global _invalidation_epoch
+    _invalidation_epoch += 1
+    note_catalog_write() # Önbellek bir süre ikincil üyelerden değil primary'den yeniden doldurulur
+    await catalog_cache.invalidate_tags(*tags)
+
+async def drop_catalog_cache() -> None:
+    """Başka bir worker'da katalog yazması görüldüğünde çağrılır: hangi kayıtların etkilendiği bilinmediğinden tümü silinir."""
+    global _invalidation_epoch
+    _invalidation_epoch += 1
+    note_catalog_write()
+    await catalog_cache.clear()
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+def cached(namespace: str, tags: Callable[[Dict[str, Any], Any], Iterable[str]]):
+    """
+    Async CRUD okuma fonksiyonunu katalog önbelleğiyle sarar. Anahtar, varsayılanları
+    uygulanmış (normalize edilmiş) argümanlardan oluşur; böylece get_contents(limit=10) ile
+    get_contents(skip=0, limit=10) aynı kaydı kullanır. tags(arguments, result) kaydın etiketlerini verir.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.CATALOG_CACHE_ENABLED:
+                return await func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (namespace, _freeze(bound.arguments))
+            value = await catalog_cache.get(key)
+            if value is not _MISSING:
+                return value
+            epoch = _invalidation_epoch
+            value = await func(*args, **kwargs)
+            if epoch == _invalidation_epoch:
+                await catalog_cache.set(key, value, tags(bound.arguments, value))
+            return value
+        return wrapper
+    return decorator
+
+
+async def cached_many(
+    namespace: str,
+    ids: List[Hashable],
+    load_missing: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    tags: Callable[[Hashable], Iterable[str]],
+) -> Dict[Hashable, Any]:
+    """
+    Id başına önbelleklenen değerleri toplu okur: önbellekte olmayanlar tek bir load_missing çağrısıyla
+    (örn: tek $in sorgusu) yüklenip id başına kaydedilir. Bulunamayan id'ler sonuçta yer almaz.
+    """
+    if not settings.CATALOG_CACHE_ENABLED:
+        return await load_missing(ids)
+    found: Dict[Hashable, Any] = {}
+    missing = []
+    for item_id in ids:
+        value = await catalog_cache.get((namespace, item_id))
+        if value is _MISSING:
+            missing.append(item_id)
+        else:
+            found[item_id] = value
+    if missing:
+        epoch = _invalidation_epoch
+        loaded = await load_missing(missing)
+        if epoch == _invalidation_epoch:
+            for item_id, value in loaded.items():
+                await catalog_cache.set((namespace, item_id), value, tags(item_id))
+        found.update(loaded)
+    return found
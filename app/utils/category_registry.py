@@ -0,0 +1,96 @@
+# app/utils/category_registry.py
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.models.category import CategoryDocument
+
+# Süreç içi kategori kaydı.
+# Kategoriler küçük ve nadiren değişen bir kümedir; tamamı bellekte id'ye ve küçük harfli ada göre
+# tutulur. İçerik yazmalarında doğrulama, link oluşturma ve ad -> id çözümlemesi veritabanına gitmeden
+# buradan yapılır. Kayıt açılışta yüklenir ve bu süreçteki kategori yazmalarında güncellenir;
+# diğer worker'lardaki yazmalar paylaşılan katalog versiyonu değiştiğinde, en geç max_age_seconds sonra veya
+# bilinmeyen bir id istendiğinde görülür.
+
+
+def _object_id(value) -> Optional[ObjectId]:
+    try:
+        return ObjectId(str(value))
+    except (InvalidId, TypeError):
+        return None
+
+
+class CategoryRegistry:
+    def __init__(self, max_age_seconds: float = 60.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._by_id: Dict[ObjectId, CategoryDocument] = {}
+        # Ad benzersiz indeksi büyük/küçük harf duyarlı olduğundan bir ada birden fazla id düşebilir
+        self._ids_by_name: Dict[str, List[ObjectId]] = {}
+        self._loaded_at: Optional[float] = None
+        self.reloads = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def expire(self) -> None:
+        """Kaydı bayat işaretler; bir sonraki get_category_registry çağrısında yeniden yüklenir."""
+        self._loaded_at = None
+
+    def load(self, categories: Iterable[CategoryDocument]) -> None:
+        """Kaydı verilen kategori dökümanlarıyla baştan kurar."""
+        self._by_id = {}
+        self._ids_by_name = {}
+        for category in categories:
+            self.put(category)
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+    def put(self, category: CategoryDocument) -> None:
+        """Kategoriyi ekler veya günceller (ad değiştiyse eski ad kaydı silinir)."""
+        self.remove(category.id)
+        self._by_id[category.id] = category
+        self._ids_by_name.setdefault(category.name.casefold(), []).append(category.id)
+
+    def remove(self, category_id) -> None:
+        category = self._by_id.pop(_object_id(category_id), None)
+        if category is None:
+            return
+        key = category.name.casefold()
+        ids = [other_id for other_id in self._ids_by_name.get(key, []) if other_id != category.id]
+        if ids:
+            self._ids_by_name[key] = ids
+        else:
+            self._ids_by_name.pop(key, None)
+
+    def get(self, category_id) -> Optional[CategoryDocument]:
+        """id (string veya ObjectId) ile kategori; geçersiz veya bilinmeyen id için None."""
+        return self._by_id.get(_object_id(category_id))
+
+    def ids_for_name(self, name: str) -> List[ObjectId]:
+        """Büyük/küçük harf duyarsız ad -> id'ler."""
+        return list(self._ids_by_name.get(name.strip().casefold(), []))
+
+    def get_by_name(self, name: str) -> Optional[CategoryDocument]:
+        """Adı birebir (büyük/küçük harf duyarlı) eşleşen kategori."""
+        for category_id in self._ids_by_name.get(name.casefold(), []):
+            if self._by_id[category_id].name == name:
+                return self._by_id[category_id]
+        return None
+
+    def missing(self, category_ids: Iterable[str]) -> List[str]:
+        """Kayıtta bulunmayan (veya geçersiz) id'leri, verildikleri sırayla döndürür."""
+        return [category_id for category_id in category_ids if self.get(category_id) is None]
+
+    def all(self) -> List[CategoryDocument]:
+        """Tüm kategoriler, oluşturulma (_id) sırasıyla."""
+        return [self._by_id[category_id] for category_id in sorted(self._by_id)]
+
+    def stats(self) -> Dict[str, int]:
+        return {"categories": len(self._by_id), "reloads": self.reloads}
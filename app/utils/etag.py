@@ -0,0 +1,39 @@
+# app/utils/etag.py
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Koşullu GET (ETag / If-None-Match) yardımcıları.
+# Tekil kaynakların ETag'i verinin kendisinden (id + güncellenme zamanı/versiyon) türetilir.
+# Liste ETag'leri tüm worker'ların paylaştığı katalog versiyonundan (app/crud/catalog_state.py, her
+# katalog yazmasında artar) ve istek parametrelerinden türetilir; böylece 304 kararı tek bir _id
+# okumasıyla, liste sorgusu ve serileştirme yapılmadan verilir.
+
+
+def make_etag(*parts: Any) -> str:
+    """Verilen parçalardan güçlü (strong) bir ETag üretir."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def catalog_list_etag(request: Request, catalog_version: int) -> str:
+    """Katalog listeleri için ETag: paylaşılan katalog versiyonu, yol ve sıralanmış sorgu parametreleri."""
+    query = tuple(sorted(request.query_params.multi_items()))
+    return make_etag(catalog_version, request.url.path, query)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag ile eşleşiyor mu (zayıf karşılaştırma, RFC 7232)."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
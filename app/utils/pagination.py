@@ -0,0 +1,94 @@
+# app/utils/pagination.py
+
+import base64
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from bson import ObjectId, json_util
+
+# Keyset (cursor) sayfalama yardımcıları.
+# Cursor, son döndürülen öğenin sıralama anahtarını ve _id'sini taşıyan opak bir token'dır;
+# bir sonraki sayfa skip yerine (sort_key, _id) üzerinden indeksli bir aralık sorgusuyla okunur.
+
+class InvalidCursorError(ValueError):
+    """Cursor çözümlenemediğinde veya başka bir sıralamaya ait olduğunda fırlatılır."""
+
+
+def encode_cursor(sort_field: str, sort_value: Any, last_id: ObjectId) -> str:
+    """Sıralama alanını, son değeri ve _id'yi URL-güvenli bir token'a çevirir."""
+    raw = json_util.dumps({"f": sort_field, "v": sort_value, "id": last_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str) -> Tuple[Any, ObjectId]:
+    """Token'ı (sort_value, last_id) çiftine çevirir; farklı bir sıralamaya aitse hata verir."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        sort_value, last_id = data["v"], data["id"]
+        field = data["f"]
+    except Exception as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if field != sort_field or not isinstance(last_id, ObjectId):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return sort_value, last_id
+
+
+def keyset_filter(sort_field: str, direction: int, sort_value: Any, last_id: ObjectId) -> Dict[str, Any]:
+    """
+    (sort_field, _id) sıralamasında cursor'dan sonraki öğeleri seçen filtreyi üretir.
+    MongoDB'de null değerler en küçük kabul edildiğinden null'lar ayrıca ele alınır.
+    """
+    id_op = "$lt" if direction < 0 else "$gt"
+    if sort_field == "_id":
+        return {"_id": {id_op: last_id}}
+
+    if sort_value is None:
+        tie = {sort_field: None, "_id": {id_op: last_id}}
+        if direction < 0:
+            return tie # Azalan sırada null'lar en sonda; sadece kalan null'lar
+        return {"$or": [tie, {sort_field: {"$ne": None}}]}
+
+    clauses: List[Dict[str, Any]] = [
+        {sort_field: {id_op: sort_value}},
+        {sort_field: sort_value, "_id": {id_op: last_id}},
+    ]
+    if direction < 0:
+        clauses.append({sort_field: None}) # Azalan sırada null'lar değerli öğelerden sonra gelir
+    return {"$or": clauses}
+
+
+def keyset_sort(sort_field: str, direction: int) -> List[Tuple[str, int]]:
+    """Keyset sayfalama için _id ile kararlı hale getirilmiş sıralama ifadesi (PyMongo stili)."""
+    if sort_field == "_id":
+        return [("_id", direction)]
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def next_cursor(items: Sequence[Any], sort_field: str, limit: int) -> Optional[str]:
+    """
+    Sayfa doluysa son öğeden bir sonraki sayfanın cursor'ını üretir, değilse None döner.
+    Öğeler döküman veya projeksiyon modeli olabilir (id string olarak da gelebilir);
+    sıralama alanı öğede yoksa cursor üretilemez.
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    last_id = ObjectId(str(last.id))
+    if sort_field == "_id":
+        return encode_cursor(sort_field, last_id, last_id)
+    if not hasattr(last, sort_field):
+        return None
+    return encode_cursor(sort_field, getattr(last, sort_field), last_id)
+
+
+def next_cursor_from_docs(page_docs: Sequence[Dict[str, Any]], sort_field: str, limit: int) -> Optional[str]:
+    """
+    next_cursor'ın ham sayfa dökümanları için olanı. Sayfanın dolu olup olmadığı, okuma modellerine
+    çevrilirken atlanan öğelerden (ör. silinmiş içeriğe işaret eden kayıtlar) etkilenmesin diye
+    cursor filtrelenmemiş sayfadan üretilir.
+    """
+    if not page_docs or len(page_docs) < limit:
+        return None
+    last = page_docs[-1]
+    if sort_field == "_id":
+        return encode_cursor(sort_field, last["_id"], last["_id"])
+    return encode_cursor(sort_field, last.get(sort_field), last["_id"])
@@ -0,0 +1,159 @@
+# app/utils/prefix_index.py
+
+import bisect
+import sys
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Typeahead (otomatik tamamlama) için süreç içi prefix indeksi.
+# Anahtarlar sıralı bir listede tutulur; bir prefix'in eşleşmeleri bisect ile bulunan
+# bitişik bir aralıktır (O(log n) arama). Python'da düğüm başına dict tutan bir trie'ye göre
+# aynı prefix sorgusunu çok daha az bellekle yanıtlar.
+# İndeks açılışta kurulur ve bu süreçteki içerik yazmalarında güncellenir; diğer worker'lardaki yazmalar
+# en geç max_age_seconds sonra (yeniden kurulduğunda) görülür.
+
+# Türkçe'ye özgü harfler NFKD ile ayrışmadığı (ı) veya büyük/küçük dönüşümü farklı olduğu (İ, I) için
+# önce elle katlanır; kalan aksanlar (ş, ç, ğ, ü, ö, é, ñ ...) NFKD ile temizlenir.
+_TURKISH_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+
+# Eşleşen alanın sıralamadaki önceliği (küçük olan önce gelir)
+FIELD_PRIORITY = {"title": 0, "starring": 1, "director": 2}
+
+
+def fold_text(text: str) -> str:
+    """Metni aksansız, küçük harfli ve tek boşluklu hale getirir ("İstanbul'da Aşk" -> "istanbul'da ask")."""
+    folded = unicodedata.normalize("NFKD", text.translate(_TURKISH_FOLD))
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return " ".join(folded.casefold().split())
+
+
+def _word_suffixes(folded: str) -> List[str]:
+    """Her kelime başından başlayan son ekleri döndürür ("dark knight" -> ["dark knight", "knight"])."""
+    words = folded.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class PrefixIndex:
+    """
+    İçerik başlığı, oyuncular ve yönetmen üzerinde prefix indeksi.
+    Girdiler (katlanmış_anahtar, alan_önceliği, content_id) demetleri olarak sıralı tutulur.
+    """
+
+    def __init__(self, max_age_seconds: float = 300.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._keys: List[Tuple[str, int, str]] = []
+        # content_id -> (başlık, bu içeriğe ait girdiler, alan -> orijinal metin)
+        self._docs: Dict[str, Tuple[str, List[Tuple[str, int, str]], Dict[Tuple[str, int], str]]] = {}
+        self._loaded_at: Optional[float] = None
+        self.reloads = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def expire(self) -> None:
+        """İndeksi bayat işaretler; bir sonraki get_suggest_index çağrısında yeniden kurulur."""
+        self._loaded_at = None
+
+    def _entries_for(
+        self, content_id: str, title: str, starring: Optional[Iterable[str]], director: Optional[str]
+    ) -> Tuple[List[Tuple[str, int, str]], Dict[Tuple[str, int], str]]:
+        entries = set()
+        originals: Dict[Tuple[str, int], str] = {}
+        sources = [("title", title)] + [("starring", name) for name in (starring or [])] + [("director", director)]
+        for field, text in sources:
+            if not text:
+                continue
+            priority = FIELD_PRIORITY[field]
+            for key in _word_suffixes(fold_text(text)):
+                entries.add((key, priority, content_id))
+                originals.setdefault((key, priority), text)
+        return sorted(entries), originals
+
+    def add(
+        self, content_id: str, title: str, starring: Optional[Iterable[str]] = None, director: Optional[str] = None
+    ) -> None:
+        """İçeriği indekse ekler; zaten varsa girdileri yenileriyle değiştirir."""
+        self.remove(content_id)
+        entries, originals = self._entries_for(content_id, title, starring, director)
+        for entry in entries:
+            bisect.insort(self._keys, entry)
+        self._docs[content_id] = (title, entries, originals)
+
+    def remove(self, content_id: str) -> None:
+        """İçeriğin tüm girdilerini indeksten çıkarır (yoksa bir şey yapmaz)."""
+        doc = self._docs.pop(content_id, None)
+        if not doc:
+            return
+        for entry in doc[1]:
+            position = bisect.bisect_left(self._keys, entry)
+            if position < len(self._keys) and self._keys[position] == entry:
+                del self._keys[position]
+
+    def bulk_load(self, docs: Iterable[Tuple[str, str, Optional[Iterable[str]], Optional[str]]]) -> None:
+        """İndeksi (content_id, title, starring, director) demetlerinden sıfırdan kurar (tek sıralama)."""
+        self._keys = []
+        self._docs = {}
+        for content_id, title, starring, director in docs:
+            entries, originals = self._entries_for(content_id, title, starring, director)
+            self._keys.extend(entries)
+            self._docs[content_id] = (title, entries, originals)
+        self._keys.sort()
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+    def search(self, prefix: str, limit: int = 10, max_scan: int = 2000) -> List[Dict[str, str]]:
+        """
+        Prefix ile başlayan içerikleri döndürür; her içerik bir kez, başlık eşleşmeleri
+        oyuncu/yönetmen eşleşmelerinden önce gelir. Tarama max_scan girdiyle sınırlıdır.
+        """
+        folded = fold_text(prefix)
+        if not folded:
+            return []
+        start = bisect.bisect_left(self._keys, (folded,))
+        best: Dict[str, Tuple[int, int, str]] = {} # content_id -> (öncelik, anahtar uzunluğu, anahtar)
+        for key, priority, content_id in self._keys[start:start + max_scan]:
+            if not key.startswith(folded):
+                break
+            rank = (priority, len(key), key)
+            if content_id not in best or rank < best[content_id]:
+                best[content_id] = rank
+
+        ranked = sorted(best.items(), key=lambda item: item[1])[:limit]
+        results = []
+        for content_id, (priority, _, key) in ranked:
+            title, _, originals = self._docs[content_id]
+            field = next(name for name, value in FIELD_PRIORITY.items() if value == priority)
+            results.append({
+                "id": content_id,
+                "title": title,
+                "matched_field": field,
+                "matched_text": originals[(key, priority)],
+            })
+        return results
+
+    def memory_usage_bytes(self) -> int:
+        """İndeksin yaklaşık bellek kullanımı (liste, demetler, anahtar string'leri ve içerik kayıtları)."""
+        total = sys.getsizeof(self._keys) + sys.getsizeof(self._docs)
+        seen_strings = set()
+        for key, _, content_id in self._keys:
+            total += sys.getsizeof((key, 0, content_id))
+            for text in (key, content_id):
+                if id(text) not in seen_strings:
+                    seen_strings.add(id(text))
+                    total += sys.getsizeof(text)
+        for title, entries, originals in self._docs.values():
+            total += sys.getsizeof(title) + sys.getsizeof(entries) + sys.getsizeof(originals)
+        return total
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "contents": len(self._docs),
+            "entries": len(self._keys),
+            "memory_bytes": self.memory_usage_bytes(),
+            "reloads": self.reloads,
+        }
@@ -0,0 +1,60 @@
+# app/utils/responses.py
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from app.models.read_models import ReadModel
+
+# Güvenilir hızlı serileştirme yolu.
+# Endpoint bir şema nesnesi döndürdüğünde FastAPI onu response_model'e karşı yeniden doğrular,
+# dict'e çevirir ve stdlib json ile kodlar. Router zaten doğrulanmış şema nesneleri ürettiğinde
+# bu yardımcı, pydantic-core serileştiricisiyle (Rust) nesneleri tek seferde doğrudan JSON byte'larına
+# yazar ve Response döndürerek FastAPI'nin tekrar doğrulamasını atlar. response_model yine
+# dekoratörde kalır; OpenAPI dokümantasyonu değişmez.
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def trusted_json_response(
+    content: Any,
+    schema: Any,
+    status_code: int = status.HTTP_200_OK,
+    response: Optional[Response] = None,
+) -> Response:
+    """
+    Doğrulanmış şema nesne(ler)ini JSON'a serileştirir. schema, content'in tipidir
+    (örn: List[ContentPublicShort]). Endpoint'e enjekte edilen response verilirse üzerinde
+    ayarlanmış header'lar (ETag, X-Next-Cursor ...) yeni yanıta taşınır.
+    """
+    # FastAPI response_model serileştirmesiyle aynı çıktı için alias'lar kullanılır (örn: UserPublic.__v)
+    body = _adapter(schema).dump_json(content, by_alias=True)
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _read_model_fallback(value: Any) -> Any:
+    # to_json'ın tanımadığı değerler: okuma modelleri dict'e, ObjectId gibi değerler string'e çevrilir
+    if isinstance(value, ReadModel):
+        return value.to_dict()
+    return str(value)
+
+
+def read_model_json_response(
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    response: Optional[Response] = None,
+) -> Response:
+    """
+    app.models.read_models okuma modellerini (liste/dict içinde iç içe olabilir) doğrudan JSON'a yazar.
+    Okuma modelleri public şemalarla aynı alanları taşıdığından ek doğrulama yapılmaz.
+    """
+    body = to_json(content, fallback=_read_model_fallback)
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
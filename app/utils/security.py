@@ -1,9 +1,23 @@
 # app/utils/security.py
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
 from passlib.context import CryptContext
 
-# Şifre hashleme context'i oluşturuyoruz, bcrypt algoritmasını kullanacağız
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+# Şifre hashleme context'i oluşturuyoruz, bcrypt algoritmasını kullanacağız.
+# Maliyet (rounds) BCRYPT_ROUNDS'tan gelir; farklı maliyetle oluşturulmuş hash'ler "güncellenmeli" sayılır
+# ve girişte doğru şifre verildiğinde yeni maliyetle yeniden hashlenir (verify_and_update_password_async)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verilen düz metin şifreyi, hashlenmiş şifreyle karşılaştırır."""
@@ -11,4 +25,55 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Verilen şifreyi hashler."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+# bcrypt işlem başına ~100-300 ms CPU harcar; async handler içinde doğrudan çağrılırsa worker'daki
+# diğer tüm istekler bekler. İstek yolunda aşağıdaki async sürümler kullanılır: iş sınırlı bir thread
+# havuzunda çalışır (bcrypt GIL'i bırakır), aynı anda en fazla PASSWORD_HASH_MAX_WORKERS işlem yapılır
+# ve sırada PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS'tan uzun bekleyen istek PasswordHasherBusyError alır.
+
+class PasswordHasherBusyError(Exception):
+    """Şifre hashleme havuzunda kuyruk zaman aşımı süresi içinde yer açılmadı."""
+
+
+T = TypeVar("T")
+
+_hash_executor = ThreadPoolExecutor(max_workers=max(settings.PASSWORD_HASH_MAX_WORKERS, 1), thread_name_prefix="bcrypt")
+_hash_slots = asyncio.Semaphore(max(settings.PASSWORD_HASH_MAX_WORKERS, 1))
+_hash_stats = {"completed": 0, "rejected": 0, "waiting": 0, "running": 0}
+
+async def _run_in_hash_pool(func: Callable[..., T], *args) -> T:
+    if settings.PASSWORD_HASH_MAX_WORKERS <= 0:
+        return func(*args) # Havuz kapalı: event loop üzerinde çalışır (sadece karşılaştırma/benchmark için)
+    _hash_stats["waiting"] += 1
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        _hash_stats["rejected"] += 1
+        raise PasswordHasherBusyError("Password hashing queue is full, try again later")
+    finally:
+        _hash_stats["waiting"] -= 1
+    _hash_stats["running"] += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_stats["running"] -= 1
+        _hash_stats["completed"] += 1
+        _hash_slots.release()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Şifreyi doğrular; hash BCRYPT_ROUNDS'tan farklı maliyetle oluşturulmuşsa yeni hash'i de döndürür
+    (doğru şifre + yeni hash -> çağıran saklamalı). Doğrulama ve yeniden hashleme havuzda tek işte yapılır.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+def password_hasher_stats() -> Dict[str, int]:
+    return {"max_workers": settings.PASSWORD_HASH_MAX_WORKERS, **_hash_stats}
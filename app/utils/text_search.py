@@ -0,0 +1,24 @@
+# app/utils/text_search.py
+
+from typing import Optional
+
+# MongoDB text indeksinin desteklediği analizör (stemming + stop words) dilleri.
+# İçeriklerin 'language' alanı serbest metindir (örn: "English", "Korean"); text indeksinin
+# language_override alanına desteklenmeyen bir dil yazılırsa insert hata verir. Bu yüzden dil
+# burada MongoDB adına çevrilir, desteklenmeyen diller "none" (sadece tokenizasyon) olur.
+TEXT_SEARCH_LANGUAGES = {
+    "tr": "turkish", "turkish": "turkish", "türkçe": "turkish", "turkce": "turkish",
+    "en": "english", "english": "english", "ingilizce": "english",
+    "de": "german", "german": "german", "deutsch": "german", "almanca": "german",
+    "fr": "french", "french": "french", "français": "french", "francais": "french", "fransızca": "french",
+    "es": "spanish", "spanish": "spanish", "español": "spanish", "espanol": "spanish", "ispanyolca": "spanish",
+}
+
+# Alanı olmayan eski dökümanlar ve dili belirtilmemiş aramalar için indeks varsayılanı
+DEFAULT_TEXT_SEARCH_LANGUAGE = "english"
+
+def text_search_language(language: Optional[str]) -> str:
+    """İçerik dilini (kod veya ad) MongoDB text analizörü adına çevirir."""
+    if not language:
+        return DEFAULT_TEXT_SEARCH_LANGUAGE
+    return TEXT_SEARCH_LANGUAGES.get(language.strip().lower(), "none")
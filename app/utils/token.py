@@ -1,13 +1,74 @@
 # app/utils/token.py
 
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from app.core.config import settings # Ayarlarımızı import ediyoruz
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+
+
+class VerifiedTokenCache:
+    """
+    Doğrulanmış token'lar için boyut sınırlı LRU önbellek: token özeti -> (exp, claim'ler).
+    İstemci aynı token'ı süresi dolana kadar her istekte gönderdiğinden imza (HMAC) doğrulaması
+    token başına bir kez yapılır. Token'ın kendisi değil özeti saklanır; süresi dolmuş kayıt asla döndürülmez.
+    Sadece başarıyla doğrulanan token'lar önbelleğe alınır.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1]) # Çağıran claim'leri değiştirse de önbellek etkilenmesin
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return # Süresiz token'lar önbelleğe alınmaz
+        self._entries[self._digest(token)] = (float(exp), dict(claims))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+verified_token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -15,7 +76,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
+
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -23,10 +84,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 def decode_access_token(token: str) -> Optional[dict]:
     """
     Verilen token'ı decode eder ve payload'ı döner.
-    Hata durumunda None döner.
+    Hata durumunda None döner. Daha önce doğrulanmış ve süresi dolmamış token'lar önbellekten döner.
     """
+    if settings.TOKEN_CACHE_ENABLED:
+        claims = verified_token_cache.get(token)
+        if claims is not None:
+            return claims
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    if settings.TOKEN_CACHE_ENABLED:
+        verified_token_cache.put(token, payload)
+    return payload
+
+def create_refresh_token() -> Tuple[str, str]:
+    """Opak (JWT olmayan) bir refresh token üretir: (istemciye verilecek token, saklanacak özeti)."""
+    refresh_token = secrets.token_urlsafe(32)
+    return refresh_token, hash_refresh_token(refresh_token)
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """Refresh token özeti. Token 256 bit rastgele olduğundan hızlı bir özet yeterlidir (bcrypt gerekmez)."""
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
@@ -0,0 +1,154 @@
+# app/utils/write_behind.py
+
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+
+# İzleme ilerlemesi (heartbeat) için write-behind tamponu.
+# Oynatıcı birkaç saniyede bir ilerleme gönderir; her birini ayrı bir yazma olarak MongoDB'ye
+# göndermek yerine (kullanıcı, içerik) çifti başına sadece en son değer bellekte tutulur ve
+# tampon her flush_interval_seconds'ta (veya max_pending dolunca, ya da kapanışta) tek bir
+# bulk_write ile boşaltılır. Son yazılan değere göre min_delta'dan az değişen ilerleme hiç yazılmaz.
+
+PairKey = Tuple[ObjectId, ObjectId] # (user_id, content_id)
+
+
+class PendingProgress(NamedTuple):
+    progress_percentage: int
+    observed_at: datetime
+
+
+FlushCallback = Callable[[Dict[PairKey, PendingProgress]], Awaitable[None]]
+
+
+class WatchProgressBuffer:
+    def __init__(
+        self,
+        flush_callback: FlushCallback,
+        flush_interval_seconds: float = 5.0,
+        min_delta: int = 1,
+        max_pending: int = 10_000,
+        max_tracked: int = 100_000,
+    ) -> None:
+        self.flush_callback = flush_callback
+        self.flush_interval_seconds = flush_interval_seconds
+        self.min_delta = min_delta
+        self.max_pending = max_pending
+        self.max_tracked = max_tracked
+        self._pending: Dict[PairKey, PendingProgress] = {}
+        # Çift başına en son yazılan ilerleme (delta kontrolü için, LRU ile sınırlı)
+        self._last_written: "OrderedDict[PairKey, int]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self._overflow_flush: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self.accepted = 0
+        self.coalesced = 0 # Henüz yazılmamış bir değerin üzerine yazılanlar
+        self.skipped = 0 # Delta eşiğinin altında kaldığı için atılanlar
+        self.flushed = 0 # Veritabanına yazılan çift sayısı
+        self.flush_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, user_id: ObjectId, content_id: ObjectId, progress_percentage: int, observed_at: Optional[datetime] = None) -> bool:
+        """İlerlemeyi tampona alır; delta eşiğinin altında kaldıysa False döner (yazılmayacak)."""
+        key = (user_id, content_id)
+        observed_at = observed_at or datetime.utcnow()
+        current = self._pending.get(key)
+        if current is not None and current.observed_at > observed_at:
+            return True # Sıra dışı gelen eski heartbeat, tampondaki daha yeni değeri ezmez
+        last_written = self._last_written.get(key)
+        if (
+            current is None
+            and last_written is not None
+            and progress_percentage != 100 # Bitirme her zaman yazılır
+            and abs(progress_percentage - last_written) < self.min_delta
+        ):
+            self.skipped += 1
+            return False
+
+        if current is not None:
+            self.coalesced += 1
+        self._pending[key] = PendingProgress(progress_percentage, observed_at)
+        self.accepted += 1
+        if len(self._pending) >= self.max_pending and (self._overflow_flush is None or self._overflow_flush.done()):
+            self._overflow_flush = asyncio.get_running_loop().create_task(self.flush())
+        return True
+
+    def get(self, user_id: ObjectId, content_id: ObjectId) -> Optional[PendingProgress]:
+        """Çift için henüz yazılmamış değer (yoksa None)."""
+        return self._pending.get((user_id, content_id))
+
+    def discard(self, user_id: ObjectId, content_id: ObjectId) -> None:
+        """Çift için bekleyen değeri atar (örn: kayıt silindi veya doğrudan yazıldı)."""
+        key = (user_id, content_id)
+        self._pending.pop(key, None)
+        self._last_written.pop(key, None)
+
+    def remember_written(self, user_id: ObjectId, content_id: ObjectId, progress_percentage: int) -> None:
+        """Tampon dışında yapılan bir yazmayı delta kontrolü için kaydeder."""
+        key = (user_id, content_id)
+        self._last_written[key] = progress_percentage
+        self._last_written.move_to_end(key)
+        while len(self._last_written) > self.max_tracked:
+            self._last_written.popitem(last=False)
+
+    async def flush(self) -> int:
+        """Bekleyen tüm değerleri tek bir bulk_write ile yazar; yazılan çift sayısını döner."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                await self.flush_callback(batch)
+            except Exception as e:
+                self.flush_errors += 1
+                print(f"Watch progress flush failed ({len(batch)} pairs will be retried): {e}")
+                # Bu arada gelen daha yeni değerler korunur
+                for key, pending in batch.items():
+                    self._pending.setdefault(key, pending)
+                return 0
+            for (user_id, content_id), pending in batch.items():
+                self.remember_written(user_id, content_id, pending.progress_percentage)
+            self.flushed += len(batch)
+            return len(batch)
+
+    async def _run(self) -> None:
+        # İptal yerine durdurma olayı beklenir ki süren bir bulk_write yarıda kesilip kaybolmasın
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Periyodik boşaltmayı durdurur ve kalanları yazar (uygulama kapanışında)."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "accepted": self.accepted,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "flushed": self.flushed,
+            "flush_errors": self.flush_errors,
+        }
@@ -0,0 +1,82 @@
+# backend_fastapi/benchmarks/bench_auth.py
+#
+# İstek başına kimlik doğrulama maliyeti benchmark'ı (veritabanı gerektirmez).
+# Aynı access token'ı tekrar tekrar doğrular (istemci token'ı süresi dolana kadar her istekte gönderir):
+#   decode:     app.utils.token.decode_access_token (python-jose decode + HMAC doğrulaması)
+#   dependency: app.dependencies.get_current_user (principal önbelleği ısınmış, veritabanına gidilmez)
+# Her ikisi doğrulanmış token önbelleği kapalıyken (önce) ve açıkken (sonra) ölçülür.
+#
+# Kullanım:
+#   python -m benchmarks.bench_auth --rounds 20000
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.crud import user as crud_user
+from app.dependencies import get_current_user
+from app.models.read_models import Principal
+from app.utils import token as token_utils
+
+BENCH_EMAIL = "bench@example.com"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def report(name: str, samples: List[float]) -> float:
+    mean = statistics.mean(samples)
+    print(
+        f"  {name:<7} mean={mean * 1e6:.1f}us "
+        f"p50={percentile(samples, 0.50) * 1e6:.1f}us p99={percentile(samples, 0.99) * 1e6:.1f}us"
+    )
+    return mean
+
+
+async def measure(rounds: int, func: Callable[[], Awaitable]) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-request auth overhead with and without the verified-token cache")
+    parser.add_argument("--rounds", type=int, default=20_000)
+    args = parser.parse_args()
+
+    access_token = token_utils.create_access_token({"sub": BENCH_EMAIL})
+    # Principal önbelleği ısıtılır ki ölçüm sadece token doğrulamasını ve bağımlılığın kendisini kapsasın;
+    # önbelleğe crud_user.get_principal'ın yazdığı nesnenin aynısı (projekte dökümandan Principal) konur
+    user = Principal.from_bson({"_id": ObjectId(), "email": BENCH_EMAIL, "username": "bench", "is_active": True})
+    await crud_user.principal_cache.set(BENCH_EMAIL, user, [f"user:{user.id}"])
+
+    async def decode() -> None:
+        assert token_utils.decode_access_token(access_token) is not None
+
+    async def dependency() -> None:
+        assert await get_current_user(access_token) is user
+
+    for name, func in (("decode", decode), ("dependency", dependency)):
+        print(f"{name} x {args.rounds}")
+        settings.TOKEN_CACHE_ENABLED = False
+        before = report("before", await measure(args.rounds, func))
+        settings.TOKEN_CACHE_ENABLED = True
+        token_utils.verified_token_cache.clear()
+        after = report("after", await measure(args.rounds, func))
+        print(f"  speedup (mean): {before / after:.1f}x")
+
+    print(f"token cache: {token_utils.verified_token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
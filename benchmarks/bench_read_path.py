@@ -0,0 +1,148 @@
+# backend_fastapi/benchmarks/bench_read_path.py
+#
+# Okuma yolu benchmark'ı: Beanie dökümanları vs ham BSON + okuma modelleri (app/models/read_models.py).
+# Ayrı bir benchmark veritabanına N sentetik içerik ve tek bir kullanıcı için N watchlist öğesi yazar,
+# ardından aynı veriyi iki yolla okuyup public şemaya uygun JSON byte'larına çevirir:
+#   beanie: ContentDocument / WatchlistItemDocument (fetch_links) -> public şema -> JSON
+#   raw:    crud_content.get_contents / crud_watchlist.get_user_watchlist -> okuma modelleri -> JSON
+#
+# Kullanım:
+#   BENCH_MONGO_URI=mongodb://localhost:27017/netflix_bench_db python -m benchmarks.bench_read_path --docs 10000
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from beanie import init_beanie
+from beanie.odm.operators.find.comparison import In
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models import get_document_models
+from app.models.content import ContentDocument
+from app.models.user import UserDocument
+from app.models.watchlist import WatchlistItemDocument
+from app.crud import content as crud_content
+from app.crud import watchlist as crud_watchlist
+from app.schemas.content import ContentPublicShort
+from app.schemas.watchlist import WatchlistItemPublic
+from app.utils.responses import read_model_json_response, trusted_json_response
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017/netflix_bench_db")
+BENCH_USER_EMAIL = "bench@example.com"
+
+WORDS = ["casino", "royale", "godfather", "wick", "night", "dark", "knight", "empire", "galaxy", "dragon"]
+PEOPLE = ["Daniel Craig", "Al Pacino", "Keanu Reeves", "Eva Green", "Haluk Bilginer"]
+
+
+def synthetic_content(i: int) -> dict:
+    return ContentDocument(
+        title=f"{' '.join(random.sample(WORDS, 3)).title()} {i}",
+        description=" ".join(random.choices(WORDS, k=30)),
+        rating=round(random.uniform(1, 10), 1),
+        starring=random.sample(PEOPLE, 2),
+        director=random.choice(PEOPLE),
+        tags=random.sample(WORDS, 3),
+        content_type=random.choice(["MOVIE", "TV_SHOW"]),
+    ).model_dump(by_alias=True, exclude={"id"})
+
+
+async def seed(total: int, batch_size: int = 5000) -> UserDocument:
+    contents = ContentDocument.get_motor_collection()
+    watchlist = WatchlistItemDocument.get_motor_collection()
+    await contents.delete_many({})
+    await watchlist.delete_many({})
+    await UserDocument.find(UserDocument.email == BENCH_USER_EMAIL).delete()
+
+    user = UserDocument(
+        email=BENCH_USER_EMAIL, username="bench", first_name="Bench", last_name="User",
+        password="-", hashed_password="-",
+    )
+    await user.insert()
+    for start in range(0, total, batch_size):
+        batch = [synthetic_content(i) for i in range(start, min(start + batch_size, total))]
+        result = await contents.insert_many(batch, ordered=False)
+        await watchlist.insert_many([
+            WatchlistItemDocument(
+                user=UserDocument.link_from_id(user.id), content=ContentDocument.link_from_id(content_id)
+            ).model_dump(by_alias=True, exclude={"id"})
+            for content_id in result.inserted_ids
+        ])
+    print(f"Seeded {total} contents and {total} watchlist items")
+    return user
+
+
+async def beanie_contents(limit: int) -> bytes:
+    docs = await ContentDocument.find({}).sort([("_id", 1)]).limit(limit).to_list()
+    items = [ContentPublicShort.model_validate({**doc.model_dump(), "id": str(doc.id)}) for doc in docs]
+    return trusted_json_response(items, List[ContentPublicShort]).body
+
+
+async def raw_contents(limit: int) -> bytes:
+    return read_model_json_response(await crud_content.get_contents(limit=limit)).body
+
+
+async def beanie_watchlist(user: UserDocument, limit: int) -> bytes:
+    # Önceki yol: sayfayı linksiz oku, linkleri tek bir $in + fetch_links sorgusuyla çöz
+    page = await WatchlistItemDocument.find(
+        WatchlistItemDocument.user == UserDocument.link_from_id(user.id)
+    ).sort([("added_at", -1), ("_id", -1)]).limit(limit).to_list()
+    docs = await WatchlistItemDocument.find(In(WatchlistItemDocument.id, [doc.id for doc in page]), fetch_links=True).to_list()
+    items = [
+        WatchlistItemPublic(id=str(doc.id), user_id=str(user.id), content=doc.content, added_at=doc.added_at)
+        for doc in docs
+    ]
+    return trusted_json_response(items, List[WatchlistItemPublic]).body
+
+
+async def raw_watchlist(user: UserDocument, limit: int) -> bytes:
+    items, _ = await crud_watchlist.get_user_watchlist(user.id, limit=limit)
+    return read_model_json_response(items).body
+
+
+async def measure(label: str, repeats: int, func: Callable[[], Awaitable[bytes]]) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(samples)
+    print(f"  {label:<7} p50={median:.1f}ms min={min(samples):.1f}ms max={max(samples):.1f}ms")
+    return median
+
+
+async def run(total: int, repeats: int) -> None:
+    # Önbellek ölçülen yolu atlatmasın
+    settings.CATALOG_CACHE_ENABLED = False
+
+    client = AsyncIOMotorClient(BENCH_MONGO_URI)
+    db_name = BENCH_MONGO_URI.rsplit("/", 1)[-1].split("?")[0] or "netflix_bench_db"
+    await init_beanie(database=client[db_name], document_models=get_document_models())
+
+    user = await UserDocument.find_one(UserDocument.email == BENCH_USER_EMAIL)
+    if not user or await ContentDocument.get_motor_collection().estimated_document_count() != total:
+        user = await seed(total)
+
+    print(f"contents ({total} docs)")
+    slow = await measure("beanie", repeats, lambda: beanie_contents(total))
+    fast = await measure("raw", repeats, lambda: raw_contents(total))
+    print(f"  speedup {slow / fast:.1f}x")
+
+    print(f"watchlist ({total} items)")
+    slow = await measure("beanie", repeats, lambda: beanie_watchlist(user, total))
+    fast = await measure("raw", repeats, lambda: raw_watchlist(user, total))
+    print(f"  speedup {slow / fast:.1f}x")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Beanie documents vs raw BSON read models")
+    parser.add_argument("--docs", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.docs, args.repeats))
@@ -0,0 +1,94 @@
+# backend_fastapi/benchmarks/bench_search.py
+#
+# /content?q= arama gecikmesi benchmark'ı.
+# Ayrı bir benchmark veritabanına N sentetik içerik yazar, text indeksini Beanie üzerinden
+# oluşturur ve crud_content.get_contents aramalarının p50/p95/p99 gecikmesini ölçer.
+#
+# Kullanım:
+#   BENCH_MONGO_URI=mongodb://localhost:27017/netflix_bench_db python -m benchmarks.bench_search --docs 100000
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models import get_document_models
+from app.models.content import ContentDocument
+from app.crud import content as crud_content
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017/netflix_bench_db")
+
+WORDS = [
+    "casino", "royale", "godfather", "wick", "night", "dark", "knight", "empire", "galaxy", "dragon",
+    "ghost", "shadow", "river", "storm", "winter", "summer", "love", "war", "secret", "garden",
+    "istanbul", "yolculuk", "gece", "aşk", "savaş", "rüya", "krieg", "nacht", "guerre", "amour", "noche",
+]
+PEOPLE = ["Daniel Craig", "Al Pacino", "Keanu Reeves", "Eva Green", "Haluk Bilginer", "Tuba Büyüküstün"]
+LANGUAGES = ["English", "Turkish", "German", "French", "Spanish", "Korean"]
+QUERIES = ["casino", "dark knight", "savaş", "istanbul gece", "guerre amour", "Keanu", "secret garden"]
+
+
+def synthetic_content(i: int) -> dict:
+    title = " ".join(random.sample(WORDS, 3)).title()
+    return ContentDocument(
+        title=f"{title} {i}",
+        description=" ".join(random.choices(WORDS, k=30)),
+        rating=round(random.uniform(1, 10), 1),
+        starring=random.sample(PEOPLE, 2),
+        director=random.choice(PEOPLE),
+        language=random.choice(LANGUAGES),
+        tags=random.sample(WORDS, 3),
+        content_type=random.choice(["MOVIE", "TV_SHOW"]),
+    ).model_dump(by_alias=True, exclude={"id"})
+
+
+async def seed(total: int, batch_size: int = 5000):
+    collection = ContentDocument.get_motor_collection()
+    await collection.delete_many({})
+    for start in range(0, total, batch_size):
+        batch = [synthetic_content(i) for i in range(start, min(start + batch_size, total))]
+        await collection.insert_many(batch, ordered=False)
+    print(f"Seeded {total} contents")
+
+
+async def run(total: int, repeats: int, limit: int):
+    # Tekrarlanan sorgular katalog önbelleğinden dönmesin
+    settings.CATALOG_CACHE_ENABLED = False
+
+    client = AsyncIOMotorClient(BENCH_MONGO_URI)
+    db_name = BENCH_MONGO_URI.rsplit("/", 1)[-1].split("?")[0] or "netflix_bench_db"
+    await init_beanie(database=client[db_name], document_models=get_document_models())
+
+    if await ContentDocument.get_motor_collection().estimated_document_count() != total:
+        await seed(total)
+
+    for sort_by in (None, "-rating"):
+        latencies = []
+        for _ in range(repeats):
+            for q in QUERIES:
+                started = time.perf_counter()
+                await crud_content.get_contents(limit=limit, search_query=q, sort_by=sort_by)
+                latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        label = "relevance+rating" if sort_by is None else sort_by
+        print(f"[{label}] docs={total} queries={len(latencies)} "
+              f"p50={statistics.median(latencies):.2f}ms p95={p95:.2f}ms p99={p99:.2f}ms")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /content?q= search latency")
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.docs, args.repeats, args.limit))
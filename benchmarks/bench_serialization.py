@@ -0,0 +1,105 @@
+# backend_fastapi/benchmarks/bench_serialization.py
+#
+# Liste yanıtı serileştirme benchmark'ı (veritabanı gerektirmez).
+# 100 öğelik bir ContentPublicShort sayfasını iki yolla JSON byte'larına çevirir:
+#   eski:  öğe başına model_dump -> model_validate, ardından FastAPI'nin response_model
+#          doğrulaması (serialize_response) ve JSONResponse (stdlib json)
+#   yeni:  app.utils.responses.trusted_json_response (pydantic-core dump_json, tek geçiş)
+#
+# Kullanım:
+#   python -m benchmarks.bench_serialization --items 100 --rounds 2000
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.content import ContentPublicShort
+from app.utils.responses import trusted_json_response
+
+WORDS = ["casino", "royale", "godfather", "wick", "night", "dark", "knight", "empire", "galaxy", "dragon"]
+PEOPLE = ["Daniel Craig", "Al Pacino", "Keanu Reeves", "Eva Green", "Haluk Bilginer"]
+
+
+def synthetic_page(items: int) -> List[ContentPublicShort]:
+    return [
+        ContentPublicShort.model_validate({
+            "_id": ObjectId(),
+            "title": " ".join(random.sample(WORDS, 3)).title(),
+            "description": " ".join(random.choices(WORDS, k=30)),
+            "rating": round(random.uniform(1, 10), 1),
+            "starring": random.sample(PEOPLE, 2),
+            "director": random.choice(PEOPLE),
+            "tags": random.sample(WORDS, 3),
+            "content_type": random.choice(["MOVIE", "TV_SHOW"]),
+            "cover_image_url": f"https://img.example.com/{i}.jpg",
+        })
+        for i in range(items)
+    ]
+
+
+async def old_path(page: List[ContentPublicShort], field) -> bytes:
+    # Eski router: her öğe dict'e çevrilip yeniden doğrulanıyordu
+    items = []
+    for item in page:
+        item_dict = item.model_dump()
+        item_dict["id"] = str(item.id)
+        items.append(ContentPublicShort.model_validate(item_dict))
+    content = await serialize_response(field=field, response_content=items, is_coroutine=True)
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def new_path(page: List[ContentPublicShort]) -> bytes:
+    return trusted_json_response(page, List[ContentPublicShort]).body
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def report(name: str, samples: List[float]) -> None:
+    print(
+        f"{name:<6} mean={statistics.mean(samples) * 1000:.3f}ms "
+        f"p50={percentile(samples, 0.50) * 1000:.3f}ms p99={percentile(samples, 0.99) * 1000:.3f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    page = synthetic_page(args.items)
+    field = create_model_field(name="Response_read_all_content", type_=List[ContentPublicShort], mode="serialization")
+
+    # İki yol aynı JSON'u üretmeli
+    assert json.loads(await old_path(page, field)) == json.loads(new_path(page))
+
+    old_samples, new_samples = [], []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        await old_path(page, field)
+        old_samples.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        new_path(page)
+        new_samples.append(time.perf_counter() - start)
+
+    print(f"{args.items} items x {args.rounds} rounds")
+    report("old", old_samples)
+    report("new", new_samples)
+    print(f"speedup (mean): {statistics.mean(old_samples) / statistics.mean(new_samples):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+# backend_fastapi/benchmarks/check_read_policies.py
+#
+# Okuma politikalarının kontrolü (app/core/read_policies.py).
+# Katalog ve kullanıcı okumalarını bir replica set'e karşı çalıştırır, pymongo CommandListener ile
+# her komutla gönderilen $readPreference / readConcern'ü kaydeder ve beklenen politikayla
+# uyuşmayan okuma varsa 1 ile çıkar. Katalog yazmasından sonraki okumaların primary'ye gittiği de
+# kontrol edilir. Tek üyeli bir replica set yeterlidir (ikincil yoksa secondaryPreferred okumaları
+# primary'ye düşer ama tercih yine de komutla gönderilir):
+#   mongod --replSet rs0 --dbpath /tmp/rs0 && mongosh --eval "rs.initiate()"
+#
+# Kullanım:
+#   BENCH_MONGO_URI="mongodb://localhost:27017/netflix_bench_db?replicaSet=rs0" python -m benchmarks.check_read_policies
+
+import asyncio
+import os
+import sys
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.read_policies import CATALOG, PRIMARY, READ_POLICIES, USER, forget_catalog_writes
+from app.crud import category as crud_category
+from app.crud import content as crud_content
+from app.crud import user as crud_user
+from app.crud import watch_history as crud_watch_history
+from app.crud import watchlist as crud_watchlist
+from app.models import get_document_models
+from app.models.user import UserDocument
+from app.schemas.category import CategoryCreate
+from app.schemas.content import ContentCreate
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017/netflix_bench_db?replicaSet=rs0")
+
+READ_COMMANDS = {"find", "aggregate"}
+
+
+class ReadPreferenceRecorder(monitoring.CommandListener):
+    def __init__(self) -> None:
+        # (komut, koleksiyon, $readPreference modu, readConcern seviyesi)
+        self.reads: List[Tuple[str, str, str, Optional[str]]] = []
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in READ_COMMANDS:
+            return
+        command = event.command
+        # primary tercihi komuta eklenmez
+        mode = command.get("$readPreference", {}).get("mode", "primary")
+        read_concern = command.get("readConcern", {}).get("level")
+        self.reads.append((event.command_name, command[event.command_name], mode, read_concern))
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+async def check(recorder: ReadPreferenceRecorder, name: str, policy: str, func: Callable[[], Awaitable]) -> bool:
+    expected = READ_POLICIES[policy]
+    expected_mode = expected.read_preference.mongos_mode
+    recorder.reads.clear()
+    await func()
+    reads = list(recorder.reads)
+    ok = bool(reads) and all(
+        mode == expected_mode and read_concern == expected.read_concern.level
+        for _, _, mode, read_concern in reads
+    )
+    detail = ", ".join(f"{cmd} {coll} [{mode}/{read_concern or 'default'}]" for cmd, coll, mode, read_concern in reads)
+    print(f"{'OK  ' if ok else 'FAIL'} {name:<28} expected {policy} ({expected_mode}): {detail or 'no reads'}")
+    return ok
+
+
+async def run() -> int:
+    # Okumalar önbellekten dönmesin, her çağrı veritabanına gitsin
+    settings.CATALOG_CACHE_ENABLED = False
+    settings.PRINCIPAL_CACHE_ENABLED = False
+
+    recorder = ReadPreferenceRecorder()
+    client = AsyncIOMotorClient(BENCH_MONGO_URI, event_listeners=[recorder])
+    db_name = BENCH_MONGO_URI.rsplit("/", 1)[-1].split("?")[0] or "netflix_bench_db"
+    await client.drop_database(db_name)
+    await init_beanie(database=client[db_name], document_models=get_document_models())
+
+    category = await crud_category.create_category(CategoryCreate(name="Action"))
+    content = await crud_content.create_content(ContentCreate(
+        title="Heat", content_type="MOVIE", featured=True, category_ids=[str(category.id)],
+        source_name="tmdb", source_id=949,
+    ))
+    user = UserDocument(
+        email="reads@example.com", username="reads", first_name="R", last_name="P", password="-",
+    )
+    await user.insert()
+    await crud_watchlist.add_to_watchlist(user, content)
+
+    # Katalog yazmasından hemen sonra bu süreçteki katalog okumaları primary'den yapılır
+    results = [
+        await check(recorder, "get_contents (after write)", PRIMARY, crud_content.get_contents),
+    ]
+    forget_catalog_writes()
+
+    results += [
+        await check(recorder, "load_category_registry", CATALOG, crud_category.load_category_registry),
+        await check(recorder, "get_contents", CATALOG, crud_content.get_contents),
+        await check(recorder, "get_content", CATALOG, lambda: crud_content.get_content(str(content.id))),
+        await check(recorder, "get_content_by_source_details", CATALOG, lambda: crud_content.get_content_by_source_details("tmdb", 949)),
+        await check(recorder, "get_home_rows", CATALOG, crud_content.get_home_rows),
+        await check(recorder, "load_suggest_index", CATALOG, crud_content.load_suggest_index),
+        await check(recorder, "get_principal", USER, lambda: crud_user.get_principal(user.email)),
+        await check(recorder, "get_watchlisted_content_ids", USER, lambda: crud_watchlist.get_watchlisted_content_ids(user.id, [content.id])),
+        await check(recorder, "get_progress_for_contents", USER, lambda: crud_watch_history.get_progress_for_contents(user.id, [content.id])),
+    ]
+
+    await client.drop_database(db_name)
+    client.close()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
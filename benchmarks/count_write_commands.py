@@ -0,0 +1,148 @@
+# backend_fastapi/benchmarks/count_write_commands.py
+#
+# Yazma yollarının MongoDB komut sayısı kontrolü.
+# Her CRUD yazma fonksiyonunu ayrı bir benchmark veritabanında çalıştırır, pymongo CommandListener ile
+# gönderilen komutları sayar ve beklenen üst sınırı aşan varsa 1 ile çıkar.
+# Kategori doğrulama/link kurma bellekteki kategori kaydından yapıldığından sayılmaz.
+# Katalog yazmaları (içerik/kategori) paylaşılan katalog versiyonunu artıran bir findAndModify daha gönderir.
+#
+# Kullanım:
+#   BENCH_MONGO_URI=mongodb://localhost:27017/netflix_bench_db python -m benchmarks.count_write_commands
+#
+# Sunucu olmadan (CI): BENCH_MONGO_URI=mongomock://netflix_bench_db ile mongomock-motor üzerinde çalışır
+# (pip install mongomock-motor). mongomock pymongo'nun komut izleme olaylarını üretmediğinden bu modda
+# sunucu komutlarına birebir karşılık gelen koleksiyon metotlarının çağrıları sayılır.
+
+import asyncio
+import os
+import sys
+from typing import Awaitable, Callable, List
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.crud import category as crud_category
+from app.crud import content as crud_content
+from app.crud import user as crud_user
+from app.crud import watchlist as crud_watchlist
+from app.models import get_document_models
+from app.models.user import UserDocument
+from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.schemas.content import ContentCreate, ContentUpdate
+from app.schemas.user import UserPreferencesSchema, UserPreferencesUpdate, UserProfileUpdate
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017/netflix_bench_db")
+
+# mongomock modunda sayılan koleksiyon metotları ve gönderecekleri sunucu komutu
+MOCK_COMMANDS = {
+    "insert_one": "insert",
+    "insert_many": "insert",
+    "update_one": "update",
+    "update_many": "update",
+    "replace_one": "update",
+    "delete_one": "delete",
+    "delete_many": "delete",
+    "bulk_write": "bulkWrite",
+    "find_one_and_update": "findAndModify",
+    "find_one_and_replace": "findAndModify",
+    "find_one_and_delete": "findAndModify",
+    "find_one": "find",
+    "find": "find",
+    "aggregate": "aggregate",
+    "count_documents": "aggregate",
+}
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self.commands: List[str] = []
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.commands.append(event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+def mock_client(counter: CommandCounter):
+    """mongomock-motor istemcisi; koleksiyon metotları çağrıldıkça karşılık gelen komut sayaca yazılır."""
+    from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection # Sadece bu modda gerekir
+
+    def counting(method: Callable, command_name: str) -> Callable:
+        def wrapper(*args, **kwargs):
+            counter.commands.append(command_name)
+            return method(*args, **kwargs)
+        return wrapper
+
+    for method_name, command_name in MOCK_COMMANDS.items():
+        method = getattr(AsyncMongoMockCollection, method_name, None)
+        if method is not None:
+            setattr(AsyncMongoMockCollection, method_name, counting(method, command_name))
+    # mongomock-motor'un with_options'ı senkron koleksiyon döndürür; okuma tercihlerinin (read_policies)
+    # tek süreçli sahte sunucuda anlamı olmadığından aynı koleksiyon kullanılır
+    AsyncMongoMockCollection.with_options = lambda self, **options: self
+    return AsyncMongoMockClient()
+
+
+async def count(counter: CommandCounter, name: str, expected: int, func: Callable[[], Awaitable]) -> bool:
+    counter.commands.clear()
+    await func()
+    commands = list(counter.commands)
+    ok = len(commands) <= expected
+    print(f"{'OK  ' if ok else 'FAIL'} {name:<28} {len(commands)} command(s) (max {expected}): {', '.join(commands)}")
+    return ok
+
+
+async def run() -> int:
+    # Önbellek geçersiz kılmaları komut göndermez ama okumaların önbellekten dönmesi sayımı etkilemesin
+    settings.CATALOG_CACHE_ENABLED = False
+
+    counter = CommandCounter()
+    if BENCH_MONGO_URI.startswith("mongomock://"):
+        client = mock_client(counter)
+    else:
+        client = AsyncIOMotorClient(BENCH_MONGO_URI, event_listeners=[counter])
+    db_name = BENCH_MONGO_URI.rsplit("/", 1)[-1].split("?")[0] or "netflix_bench_db"
+    await client.drop_database(db_name)
+    await init_beanie(database=client[db_name], document_models=get_document_models())
+
+    category = await crud_category.create_category(CategoryCreate(name="Action"))
+    await crud_category.load_category_registry()
+    user = UserDocument(
+        email="writes@example.com", username="writes", first_name="W", last_name="C", password="-",
+    )
+    await user.insert()
+    content = await crud_content.create_content(ContentCreate(title="Seed", content_type="MOVIE"))
+
+    results = [
+        await count(counter, "create_content", 2, lambda: crud_content.create_content(
+            ContentCreate(title="Casino Royale", content_type="MOVIE", category_ids=[str(category.id)])
+        )),
+        await count(counter, "update_content", 2, lambda: crud_content.update_content(
+            str(content.id), ContentUpdate(title="Seed 2", category_ids=[str(category.id)])
+        )),
+        await count(counter, "update_category", 2, lambda: crud_category.update_category(
+            str(category.id), CategoryUpdate(description="Explosions")
+        )),
+        await count(counter, "update_user_profile", 1, lambda: crud_user.update_user_profile(
+            user, UserProfileUpdate(first_name="Writes")
+        )),
+        await count(counter, "update_user_preferences", 1, lambda: crud_user.update_user_preferences(
+            user, UserPreferencesUpdate(preferences=UserPreferencesSchema(language="en"))
+        )),
+        await count(counter, "add_to_watchlist (new)", 1, lambda: crud_watchlist.add_to_watchlist(user, content)),
+        await count(counter, "add_to_watchlist (existing)", 1, lambda: crud_watchlist.add_to_watchlist(user, content)),
+    ]
+
+    await client.drop_database(db_name)
+    client.close()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
@@ -0,0 +1,119 @@
+# backend_fastapi/benchmarks/load_login_vs_catalog.py
+#
+# Yük testi: /auth/login (bcrypt) trafiği katalog endpoint'lerinin gecikmesini şişiriyor mu?
+# Uygulama süreç içinde (httpx ASGITransport) çalıştırılır; tek event loop, tek worker gibi davranır.
+# Her fazda catalog_workers eşzamanlı istemci GET /api/v1/content/ ve /api/v1/home çağırıp gecikmeyi ölçer,
+# login_workers eşzamanlı istemci durmadan giriş yapar:
+#   baseline: giriş trafiği yok
+#   inline:   PASSWORD_HASH_MAX_WORKERS=0, bcrypt event loop üzerinde (eski davranış)
+#   pool:     bcrypt sınırlı thread havuzunda (app/utils/security.py)
+# pool fazının katalog p99'u baseline'a yakın, inline fazınınki bcrypt maliyeti kadar yüksek olmalıdır.
+#
+# Kullanım:
+#   BENCH_MONGO_URI=mongodb://localhost:27017/netflix_bench_db python -m benchmarks.load_login_vs_catalog --seconds 10
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List
+
+import httpx
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.crud import user as crud_user
+from app.main import app
+from app.models import get_document_models
+from app.models.content import ContentDocument
+from app.models.user import UserDocument
+from app.schemas.user import UserCreate
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017/netflix_bench_db")
+BENCH_EMAIL = "load@example.com"
+BENCH_PASSWORD = "load-test-password"
+CATALOG_PATHS = ["/api/v1/content/?limit=20", "/api/v1/home?limit=10&categories=false"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+async def seed() -> None:
+    if not await UserDocument.find_one(UserDocument.email == BENCH_EMAIL):
+        await crud_user.create_user(UserCreate(
+            email=BENCH_EMAIL, username="loadtest", password=BENCH_PASSWORD, first_name="Load", last_name="Test",
+        ))
+    contents = ContentDocument.get_motor_collection()
+    if await contents.estimated_document_count() < 100:
+        await contents.insert_many([
+            ContentDocument(title=f"Load {i}", rating=i % 10, featured=i % 3 == 0).model_dump(by_alias=True, exclude={"id"})
+            for i in range(100)
+        ])
+
+
+async def run_phase(client: httpx.AsyncClient, seconds: float, catalog_workers: int, login_workers: int) -> Dict[str, float]:
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+    logins = 0
+
+    async def catalog_worker(offset: int) -> None:
+        i = offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(CATALOG_PATHS[i % len(CATALOG_PATHS)])
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+            i += 1
+            await asyncio.sleep(0) # Önbellekten dönen yanıtlar hiç beklemeden tamamlanabilir; diğer istemcilere sıra ver
+
+    async def login_worker() -> None:
+        nonlocal logins
+        while time.perf_counter() < deadline:
+            response = await client.post("/api/v1/auth/login", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+            assert response.status_code in (200, 503), response.text
+            logins += response.status_code == 200
+
+    await asyncio.gather(
+        *[catalog_worker(i) for i in range(catalog_workers)],
+        *[login_worker() for _ in range(login_workers)],
+    )
+    return {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "logins": logins,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure catalog latency while /auth/login is under load")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--catalog-workers", type=int, default=8)
+    parser.add_argument("--login-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(BENCH_MONGO_URI)
+    db_name = BENCH_MONGO_URI.rsplit("/", 1)[-1].split("?")[0] or "netflix_bench_db"
+    await init_beanie(database=client[db_name], document_models=get_document_models())
+    await seed()
+
+    pool_workers = settings.PASSWORD_HASH_MAX_WORKERS
+    phases = [("baseline", pool_workers, 0), ("inline", 0, args.login_workers), ("pool", pool_workers, args.login_workers)]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        for name, hash_workers, login_workers in phases:
+            settings.PASSWORD_HASH_MAX_WORKERS = hash_workers
+            stats = await run_phase(http, args.seconds, args.catalog_workers, login_workers)
+            print(
+                f"{name:<9} catalog requests={stats['requests']:<6} p50={stats['p50_ms']:.1f}ms "
+                f"p99={stats['p99_ms']:.1f}ms max={stats['max_ms']:.1f}ms logins={stats['logins']}"
+            )
+    settings.PASSWORD_HASH_MAX_WORKERS = pool_workers
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())